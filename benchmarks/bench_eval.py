@@ -0,0 +1,189 @@
+"""
+benchmarks/bench_eval.py
+Benchmarks for the calculator evaluation hot path
+-------------------------------------------------
+Runs a corpus of realistic calculator expressions through each evaluation
+path and reports throughput, per-call latency percentiles and peak memory
+allocated per evaluation.
+
+Targets:
+ - compile     tokenize + parse + compile, bypassing the compile cache
+ - engine      calccore.evaluate (compiled-form cache warm)
+ - sandbox     calccore.sandbox.safe_evaluate (cost-guarded)
+ - cached      cached_evaluate + sandbox, the Streamlit "=" path, cache warm
+ - calculator  Calculator.press("="), as used by every front-end
+ - decimal     DECIMAL(34) backend
+ - fraction    FRACTION backend
+
+Usage (from the repository root):
+    python -m benchmarks.bench_eval
+    python -m benchmarks.bench_eval --targets engine,decimal --rounds 50
+    python -m benchmarks.bench_eval --save base.json
+    python -m benchmarks.bench_eval --compare base.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from calccore import Calculator, engine
+from calccore.backends import DECIMAL, FRACTION
+from calccore.cache import RESULT_CACHE, cached_evaluate
+from calccore.sandbox import safe_evaluate
+
+CORPUS = [
+    # simple arithmetic and chains
+    "2+3",
+    "12.5×4-7÷2",
+    "1+2+3+4+5+6+7+8+9+10+11+12+13+14+15+16+17+18+19+20",
+    "((1+2)×(3+4)-(5-6)÷(7+8))^2",
+    # percentages
+    "250×18%",
+    "1200+1200×7.5%",
+    # trig, nested
+    "sin(30)+cos(60)+tan(45)",
+    "sin(cos(tan(0.5)))",
+    "2×sin(45)×cos(45)",
+    "asin(0.5)+acos(0.5)",
+    # logs, roots, powers
+    "ln(e^3)+log(1000)",
+    "√(16)+√(2)^2",
+    "2^10+3^5-4^3",
+    "1e5×1.05^10",
+    # factorials and combinatorics
+    "10!",
+    "20!÷18!",
+    "52nCr5",
+    "10nPr3+nCr(30,15)",
+    # Ans and constants
+    "Ans×2+π",
+    "2π×6.371e3",
+]
+
+TARGETS = ("compile", "engine", "sandbox", "cached", "calculator", "decimal", "fraction")
+
+
+def _calculator_call():
+    calc = Calculator()
+
+    def call(expr):
+        calc.expr = expr
+        calc.press("=")
+    return call
+
+
+def make_target(name):
+    if name == "compile":
+        return lambda expr: engine.CompiledExpression(engine.normalize(expr))
+    if name == "engine":
+        return lambda expr: engine.evaluate(expr, "DEG", 1.5)
+    if name == "sandbox":
+        return lambda expr: safe_evaluate(expr, "DEG", 1.5)
+    if name == "cached":
+        return lambda expr: cached_evaluate(expr, "DEG", 1.5, evaluator=safe_evaluate)
+    if name == "calculator":
+        return _calculator_call()
+    if name == "decimal":
+        backend = DECIMAL(34)
+        return lambda expr: backend.evaluate(expr, "DEG", 1.5)
+    if name == "fraction":
+        return lambda expr: FRACTION.evaluate(expr, "DEG", 1.5)
+    raise ValueError(f"Unknown target {name!r}")
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def peak_bytes_per_eval(fn, corpus):
+    tracemalloc.start()
+    try:
+        peaks = []
+        for expr in corpus:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(expr)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return statistics.mean(peaks)
+
+
+def run_target(name, corpus, rounds, warmup=2):
+    fn = make_target(name)
+    for _ in range(warmup):
+        for expr in corpus:
+            fn(expr)
+
+    timings = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(rounds):
+        for expr in corpus:
+            t0 = clock()
+            fn(expr)
+            timings.append(clock() - t0)
+    total_s = (clock() - start) / 1e9
+    timings.sort()
+    return {
+        "ops_per_sec": len(timings) / total_s,
+        "p50_us": percentile(timings, 50) / 1e3,
+        "p99_us": percentile(timings, 99) / 1e3,
+        "peak_bytes": peak_bytes_per_eval(fn, corpus),
+    }
+
+
+def print_table(results, baseline=None):
+    header = f"{'target':<12}{'ops/sec':>12}{'p50 µs':>10}{'p99 µs':>10}{'peak B/eval':>13}"
+    if baseline:
+        header += f"{'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:<12}{r['ops_per_sec']:>12,.0f}{r['p50_us']:>10.2f}"
+                f"{r['p99_us']:>10.2f}{r['peak_bytes']:>13,.0f}")
+        if baseline and name in baseline:
+            change = r["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+            line += f"{change:>+10.1%}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark calculator expression evaluation.")
+    parser.add_argument("--targets", default=",".join(TARGETS),
+                        help="comma-separated subset of: " + ", ".join(TARGETS))
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the corpus per target")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="show ops/sec change against saved results")
+    args = parser.parse_args(argv)
+
+    names = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = set(names) - set(TARGETS)
+    if unknown:
+        parser.error("unknown targets: " + ", ".join(sorted(unknown)))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    RESULT_CACHE.clear()
+    results = {name: run_target(name, CORPUS, args.rounds) for name in names}
+    print(f"{len(CORPUS)} expressions × {args.rounds} rounds, Python {sys.version.split()[0]}")
+    print_table(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+calccore
+Shared, Streamlit-free core for the calculator apps
+---------------------------------------------------
+ - engine      calculator syntax -> compiled, cached functions
+ - batch       the same expressions over NumPy arrays (imports NumPy)
+ - backends    FLOAT, DECIMAL(n) and FRACTION number modes
+ - cache       process-wide result cache
+ - sandbox     cost-bounded evaluation
+ - history     bounded, searchable calculation history
+ - memory      M+ / M- / MR / MC register
+ - modes       DEG / RAD angle modes
+ - calculator  per-session state and keypad logic used by the front-ends
+"""
+
+from .calculator import Calculator, format_result
+from .engine import (
+    NAMESPACES,
+    CompiledExpression,
+    ExpressionError,
+    compile_expression,
+    evaluate,
+    normalize,
+    register_function,
+)
+from .history import History
+from .memory import Memory
+from .modes import ANGLE_MODES, DEG, RAD
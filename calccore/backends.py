@@ -0,0 +1,248 @@
+"""
+calccore/backends.py
+Number backends for the expression engine
+-----------------------------------------
+ - FLOAT        binary floats; the engine's default fast path
+ - DECIMAL(n)   decimal arithmetic with n significant digits
+ - FRACTION     exact rationals; irrational results fall back to float
+
+The exact backends compile a separate variant of each expression whose
+number literals are built from their source text ("0.1" stays 0.1), so the
+float path never pays for them.
+
+    >>> get_backend("FRACTION").evaluate("1/3 + 1/6")
+    Fraction(1, 2)
+    >>> get_backend("DECIMAL(20)").evaluate("0.1 + 0.2")
+    Decimal('0.3')
+"""
+
+import math
+import re
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+
+from . import engine
+
+BACKEND_CHOICES = ("FLOAT", "DECIMAL(34)", "FRACTION")
+
+# Extra digits carried through a DECIMAL evaluation and rounded off at the
+# end, so that e.g. cos(60) gives 0.5 rather than 0.4999...97.
+GUARD_DIGITS = 5
+
+
+@lru_cache(maxsize=1024)
+def _exact_code(text):
+    return engine.compile_tree(engine.parse(text, exact=True))
+
+
+def _int_arg(x):
+    if x != int(x):
+        raise ValueError("factorial() only accepts integral values")
+    return int(x)
+
+
+def _fact(x):
+    return math.factorial(_int_arg(x))
+
+
+# --- Decimal math (recipes from the decimal module documentation) ---
+# Each runs inside the backend's local context, with two guard digits.
+def _dec_pi():
+    with localcontext() as ctx:
+        ctx.prec += 2
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+    return +s
+
+
+def _dec_series(x, i, s, num):
+    # shared Taylor series loop for sin (i=1, s=x) and cos (i=0, s=1)
+    with localcontext() as ctx:
+        ctx.prec += 2
+        lasts, fact, sign = 0, 1, 1
+        while s != lasts:
+            lasts = s
+            i += 2
+            fact *= i * (i - 1)
+            num *= x * x
+            sign *= -1
+            s += num / fact * sign
+    return +s
+
+
+def _dec(x):
+    if isinstance(x, Decimal):
+        return x
+    if isinstance(x, float):
+        return Decimal(str(x))
+    if isinstance(x, Fraction):
+        # e.g. Ans left by the FRACTION backend; divides in the current context
+        return Decimal(x.numerator) / Decimal(x.denominator)
+    return Decimal(x)
+
+
+def _build_decimal_namespace(mode):
+    # Called inside the backend's context, so constants get its precision.
+    pi = _dec_pi()
+    two_pi = 2 * pi
+
+    def to_rad(x):
+        x = _dec(x)
+        return x % 360 * pi / 180 if mode == "DEG" else x % two_pi
+
+    def sin(x):
+        x = to_rad(x)
+        return _dec_series(x, 1, x, x)
+
+    def cos(x):
+        return _dec_series(to_rad(x), 0, Decimal(1), Decimal(1))
+
+    def tan(x):
+        return sin(x) / cos(x)
+
+    def inverse(f):
+        # no decimal recipe: computed in float precision
+        def g(x):
+            r = f(float(x))
+            return _dec(math.degrees(r) if mode == "DEG" else r)
+        return g
+
+    def log(x, base=10):
+        x = _dec(x)
+        return x.log10() if base == 10 else x.ln() / _dec(base).ln()
+
+    ns = dict(engine._NAMESPACES[mode])
+    ns.update({
+        "_num": Decimal,
+        "pi": pi,
+        "e": Decimal(1).exp(),
+        "sqrt": lambda x: _dec(x).sqrt(),
+        "exp": lambda x: _dec(x).exp(),
+        "ln": lambda x: _dec(x).ln(),
+        "log": log,
+        "log10": lambda x: _dec(x).log10(),
+        "sin": sin,
+        "cos": cos,
+        "tan": tan,
+        "asin": inverse(math.asin),
+        "acos": inverse(math.acos),
+        "atan": inverse(math.atan),
+        "fact": _fact,
+        "factorial": _fact,
+    })
+    return ns
+
+
+def _frac_sqrt(x):
+    # exact for perfect-square rationals such as 9/4, float otherwise
+    if isinstance(x, (int, Fraction)) and x >= 0:
+        x = Fraction(x)
+        n, d = math.isqrt(x.numerator), math.isqrt(x.denominator)
+        if n * n == x.numerator and d * d == x.denominator:
+            return Fraction(n, d)
+    return math.sqrt(x)
+
+
+def _build_fraction_namespace(mode):
+    ns = dict(engine._NAMESPACES[mode])
+    ns.update({
+        "_num": Fraction,
+        "sqrt": _frac_sqrt,
+        "fact": _fact,
+        "factorial": _fact,
+    })
+    return ns
+
+
+# --- Backends ---
+# evaluate() compiles and runs an expression; run() executes already
+# compiled code in one of the backend's namespaces, which is how the
+# sandbox runs its guarded variant of the same expression.
+class FloatBackend:
+    name = "FLOAT"
+    exact = False
+
+    def namespace(self, mode):
+        return engine._NAMESPACES[mode]
+
+    def run(self, code, ns, ans=0):
+        return eval(code, ns)(ans)
+
+    def evaluate(self, text, mode="DEG", ans=0):
+        return engine.evaluate(text, mode, ans)
+
+
+class DecimalBackend:
+    exact = True
+
+    def __init__(self, precision=34):
+        self.precision = precision
+        self.name = f"DECIMAL({precision})"
+        self._namespaces = {}
+
+    def namespace(self, mode):
+        ns = self._namespaces.get(mode)
+        if ns is None:
+            with localcontext() as ctx:
+                ctx.prec = self.precision + GUARD_DIGITS
+                ns = self._namespaces[mode] = _build_decimal_namespace(mode)
+        return engine.refresh_namespace(ns, mode)
+
+    def run(self, code, ns, ans=0):
+        with localcontext() as ctx:
+            ctx.prec = self.precision + GUARD_DIGITS
+            result = eval(code, ns)(_dec(ans))
+            ctx.prec = self.precision
+            return +result if isinstance(result, Decimal) else result
+
+    def evaluate(self, text, mode="DEG", ans=0):
+        return self.run(_exact_code(engine.normalize(text)), self.namespace(mode), ans)
+
+
+class FractionBackend:
+    name = "FRACTION"
+    exact = True
+
+    def __init__(self):
+        self._namespaces = {mode: _build_fraction_namespace(mode) for mode in ("DEG", "RAD")}
+
+    def namespace(self, mode):
+        return engine.refresh_namespace(self._namespaces[mode], mode)
+
+    def run(self, code, ns, ans=0):
+        ans = Fraction(str(ans)) if isinstance(ans, float) else Fraction(ans)
+        return eval(code, ns)(ans)
+
+    def evaluate(self, text, mode="DEG", ans=0):
+        return self.run(_exact_code(engine.normalize(text)), self.namespace(mode), ans)
+
+
+FLOAT = FloatBackend()
+FRACTION = FractionBackend()
+
+_DECIMAL_RE = re.compile(r"DECIMAL(?:\((\d+)\))?")
+
+
+@lru_cache(maxsize=32)
+def DECIMAL(precision=34):
+    return DecimalBackend(precision)
+
+
+def get_backend(spec):
+    """Look up a backend by name: "FLOAT", "FRACTION", "DECIMAL" or "DECIMAL(50)"."""
+    spec = spec.strip().upper()
+    if spec == "FLOAT":
+        return FLOAT
+    if spec == "FRACTION":
+        return FRACTION
+    m = _DECIMAL_RE.fullmatch(spec)
+    if m:
+        return DECIMAL(int(m.group(1) or 34))
+    raise ValueError(f"Unknown backend {spec!r}")
@@ -0,0 +1,107 @@
+"""
+calccore/cache.py
+Process-wide result cache
+-------------------------
+Results are keyed on (normalized expression, angle mode, Ans) and shared
+by every session in the process, with LRU size and TTL eviction. Ans is
+only part of the key when the expression actually uses it. The key also
+carries the function registry's version, so re-registering a function
+retires every result computed with the old one.
+
+Not cached:
+ - expressions that call a function registered with ``pure=False``
+ - results too large to be worth keeping (e.g. 5000! or 9^9^5)
+ - errors, which are re-raised every time
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from . import engine
+from .engine import IMPURE_NAMES, compile_expression
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 600.0      # seconds
+MAX_RESULT_BITS = 4096   # larger integer results are returned but not stored
+
+_MISSING = object()
+
+
+def _cacheable(result):
+    return not (isinstance(result, int) and result.bit_length() > MAX_RESULT_BITS)
+
+
+class ResultCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (expires_at, result), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+            self.misses += 1
+            return _MISSING
+
+    def put(self, key, result):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def evaluate(self, text, mode="DEG", ans=0, evaluator=None):
+        """Cached evaluation; ``evaluator(text, mode, ans)`` computes misses."""
+        compiled = compile_expression(text)
+        if evaluator is None:
+            evaluator = lambda text, mode, ans: compiled(mode, ans)
+        if compiled.names & IMPURE_NAMES:
+            with self._lock:
+                self.bypassed += 1
+            return evaluator(compiled.text, mode, ans)
+
+        # (type, value) so that Ans=1 and Ans=1.0 don't share a result type
+        key = (compiled.text, mode, (type(ans), ans) if "Ans" in compiled.names else None,
+               engine.REGISTRY_VERSION)
+        result = self.get(key)
+        if result is _MISSING:
+            result = evaluator(compiled.text, mode, ans)
+            if _cacheable(result):
+                self.put(key, result)
+            else:
+                with self._lock:
+                    self.bypassed += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "bypassed": self.bypassed, "size": len(self._data)}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.bypassed = 0
+
+
+RESULT_CACHE = ResultCache()
+
+
+def cached_evaluate(text, mode="DEG", ans=0, evaluator=None):
+    """``engine.evaluate`` (or ``evaluator``) backed by the process-wide RESULT_CACHE."""
+    return RESULT_CACHE.evaluate(text, mode, ans, evaluator)
@@ -0,0 +1,110 @@
+"""
+calccore/calculator.py
+Calculator session state and keypad logic
+-----------------------------------------
+One ``Calculator`` per user session holds the expression being typed, the
+angle mode, number backend, Ans, the memory register and the history.
+``press(label)`` implements the keypad shared by every front-end, so the
+Streamlit apps only draw widgets and forward button labels.
+"""
+
+import sys
+
+from .cache import cached_evaluate
+from .history import History
+from .memory import Memory
+from .modes import DEG, toggle_mode
+from .sandbox import CostLimitError, safe_evaluate
+
+# What each key inserts into the expression, where that isn't its label.
+KEY_INPUTS = {
+    "√": "√(",
+    "x²": "**2",
+    "±": "(-",
+    "+/-": "(-",
+    "EXP": "×10^",
+}
+
+# Keys drawn on some keypads that have no function here.
+INERT_KEYS = {"SHIFT", "ALPHA"}
+
+
+def format_result(result, digits=12):
+    """Integral floats as ints, other floats rounded to ``digits`` places."""
+    if isinstance(result, float):
+        return int(result) if result.is_integer() else round(result, digits)
+    return result
+
+
+def check_displayable(result):
+    """Raise CostLimitError if ``result`` can't be turned into text (an int
+    past Python's int-to-str digit limit, or a Fraction made of one)."""
+    try:
+        str(result)
+    except ValueError:
+        raise CostLimitError(f"Result too large to display "
+                             f"(over {sys.get_int_max_str_digits():,} digits)") from None
+
+
+class Calculator:
+    def __init__(self, mode=DEG, backend="FLOAT", history=None):
+        self.expr = ""
+        self.mode = mode
+        self.backend = backend
+        self.ans = 0.0
+        self.memory = Memory()
+        self.history = history if history is not None else History()
+        self.error = None
+
+    def compute(self, expr):
+        """Evaluate ``expr`` with the current settings, without side effects."""
+        if self.backend == "FLOAT":
+            return cached_evaluate(expr, self.mode, self.ans, evaluator=safe_evaluate)
+        return safe_evaluate(expr, self.mode, self.ans, backend=self.backend)
+
+    def evaluate(self):
+        """Evaluate the current expression, updating Ans and the history.
+        A result that can't be displayed raises instead and changes neither."""
+        result = self.compute(self.expr)
+        check_displayable(result)
+        self.ans = result
+        self.history.add(self.expr, result)
+        return result
+
+    def toggle_mode(self):
+        self.mode = toggle_mode(self.mode)
+
+    def _memory_operand(self):
+        try:
+            return float(self.compute(self.expr or "0"))
+        except Exception:
+            return None
+
+    def press(self, label):
+        """Apply one keypad key. Errors from "=" are kept in ``self.error``."""
+        self.error = None
+        if label in ("AC", "C"):
+            self.expr = ""
+        elif label == "DEL":
+            self.expr = self.expr[:-1]
+        elif label == "=":
+            try:
+                self.expr = str(self.evaluate())
+            except Exception as e:
+                self.error = str(e)
+        elif label in ("Mode", "MODE", "Deg/Rad"):
+            self.toggle_mode()
+        elif label == "M+":
+            x = self._memory_operand()
+            if x is not None:
+                self.memory.add(x)
+        elif label == "M-":
+            x = self._memory_operand()
+            if x is not None:
+                self.memory.subtract(x)
+        elif label == "MR":
+            self.expr += str(self.memory.recall())
+        elif label == "MC":
+            self.memory.clear()
+        elif label not in INERT_KEYS:
+            self.expr += KEY_INPUTS.get(label, label)
@@ -0,0 +1,366 @@
+"""
+calccore/engine.py
+Expression engine for the fx-991 style calculators
+--------------------------------------------------
+Tokenizes calculator syntax (×, ÷, ^, √, π, %, !, nCr, nPr, Ans) once,
+parses it into a Python AST and compiles it into a reusable function.
+Compiled forms are cached by normalized expression text, so pressing "="
+on an expression that has been seen before skips parsing and compiling.
+
+    >>> evaluate("2×sin(30)+√(16)", mode="DEG")
+    5.0
+"""
+
+import ast
+import math
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be tokenized or parsed."""
+
+
+# --- Math helpers (shared by every namespace) ---
+def nPr(n, r):
+    return math.perm(int(n), int(r))
+
+
+def nCr(n, r):
+    return math.comb(int(n), int(r))
+
+
+def log(x, base=10):
+    return math.log10(x) if base == 10 else math.log(x, base)
+
+
+def _build_namespace(mode):
+    ns = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
+    ns.update({
+        "sqrt": math.sqrt,
+        "ln": math.log,
+        "log": log,
+        "fact": math.factorial,
+        "factorial": math.factorial,
+        "nPr": nPr,
+        "nCr": nCr,
+        "abs": abs,
+        "pow": pow,
+    })
+    if mode == "DEG":
+        ns.update({
+            "sin": lambda x: math.sin(math.radians(x)),
+            "cos": lambda x: math.cos(math.radians(x)),
+            "tan": lambda x: math.tan(math.radians(x)),
+            "asin": lambda x: math.degrees(math.asin(x)),
+            "acos": lambda x: math.degrees(math.acos(x)),
+            "atan": lambda x: math.degrees(math.atan(x)),
+        })
+    ns["__builtins__"] = {}
+    return ns
+
+
+# Built once at import and shared by every session. Compiled expressions
+# hold these dicts as their globals, so registering a function later is
+# visible everywhere without rebuilding or copying anything.
+_NAMESPACES = {"DEG": _build_namespace("DEG"), "RAD": _build_namespace("RAD")}
+
+# Read-only views for callers that only need to look names up.
+NAMESPACES = {mode: MappingProxyType(ns) for mode, ns in _NAMESPACES.items()}
+
+# Names whose result may differ between calls with the same arguments.
+IMPURE_NAMES = set()
+
+# Everything passed to register_function, per mode, and a counter bumped by
+# each call. Copies of the namespaces (the exact backends', the sandbox's)
+# catch up through refresh_namespace(); the result cache keys on the count.
+_REGISTERED = {"DEG": {}, "RAD": {}}
+REGISTRY_VERSION = 0
+
+
+def register_function(name, func, deg_func=None, pure=True):
+    """Make ``func`` callable by name from every expression.
+
+    ``deg_func`` is used instead in DEG mode, for angle-aware functions.
+    Pass ``pure=False`` for functions such as random draws, so results
+    that depend on them are never cached.
+    """
+    global REGISTRY_VERSION
+    if not name.isidentifier() or name.startswith("_"):
+        raise ValueError(f"Invalid function name {name!r}")
+    for mode, f in (("RAD", func), ("DEG", deg_func or func)):
+        _NAMESPACES[mode][name] = _REGISTERED[mode][name] = f
+    if pure:
+        IMPURE_NAMES.discard(name)
+    else:
+        IMPURE_NAMES.add(name)
+    REGISTRY_VERSION += 1
+
+
+def refresh_namespace(ns, mode):
+    """Add functions registered since ``ns`` (a copy of a ``mode``
+    namespace) was last refreshed; registered names win. Returns ``ns``."""
+    if ns.get("_registry_version") != REGISTRY_VERSION:
+        ns.update(_REGISTERED[mode], _registry_version=REGISTRY_VERSION)
+    return ns
+
+
+# --- Tokenizer ---
+_TOKEN_RE = re.compile(r"""
+    (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>nCr|nPr|(?:math\.)?[A-Za-z_][A-Za-z_0-9]*)
+  | (?P<op>\*\*|[-+*/^%!√π²(),])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+_SYMBOLS = str.maketrans({"×": "*", "÷": "/", "−": "-", "·": "*"})
+
+_COMBINATORICS = ("nCr", "nPr")
+
+
+def normalize(text):
+    """Canonical form of an expression, used as the cache key.
+
+    Spacing and operator spellings are unified, so "2 × 3", "2*3" and
+    "2·3" all normalize to "2*3".
+    """
+    out = []
+    prev = None
+    for kind, value in tokenize(text)[:-1]:
+        # keep a space only where two tokens would otherwise merge ("2 3")
+        if prev in ("num", "name") and kind in ("num", "name"):
+            out.append(" ")
+        out.append(value)
+        prev = kind
+    return "".join(out)
+
+
+def tokenize(text):
+    text = text.translate(_SYMBOLS)
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise ExpressionError(f"Unexpected character {text[pos]!r} at position {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group()
+        if kind == "space":
+            continue
+        if kind == "name":
+            if value.startswith("math."):
+                value = value[5:]
+            if value.startswith("_"):
+                raise ExpressionError(f"Invalid name {value!r}")
+        elif kind == "op":
+            if value == "**":
+                value = "^"
+            elif value == "π":
+                kind, value = "name", "pi"
+        tokens.append((kind, value))
+    tokens.append(("end", ""))
+    return tokens
+
+
+# --- Parser ---
+# expr    := term (('+' | '-') term)*
+# term    := combo (('*' | '/' | <implicit>) combo)*
+# combo   := unary (('nCr' | 'nPr') unary)*
+# unary   := ('-' | '+') unary | power
+# power   := postfix ('^' unary)?
+# postfix := primary ('!' | '%' | '²')*
+# primary := number | name | name '(' args ')' | '(' expr ')' | '√' postfix
+class _Parser:
+    def __init__(self, tokens, exact=False):
+        self.tokens = tokens
+        self.pos = 0
+        self.exact = exact
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def advance(self):
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def accept(self, value):
+        kind, val = self.peek()
+        if kind == "op" and val == value:
+            self.pos += 1
+            return True
+        return False
+
+    def close_paren(self):
+        # Like the real calculator, missing closing brackets at the end are implied.
+        if not self.accept(")") and self.peek()[0] != "end":
+            raise ExpressionError(f"Expected ')' but found {self.peek()[1]!r}")
+
+    def parse(self):
+        if self.peek()[0] == "end":
+            raise ExpressionError("Empty expression")
+        node = self.expr()
+        if self.peek()[0] != "end":
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while True:
+            if self.accept("+"):
+                node = ast.BinOp(node, ast.Add(), self.term())
+            elif self.accept("-"):
+                node = ast.BinOp(node, ast.Sub(), self.term())
+            else:
+                return node
+
+    def starts_operand(self):
+        kind, val = self.peek()
+        if kind == "num":
+            return True
+        if kind == "name":
+            return val not in _COMBINATORICS
+        return kind == "op" and val in ("(", "√")
+
+    def term(self):
+        node = self.combo()
+        while True:
+            if self.accept("*"):
+                node = ast.BinOp(node, ast.Mult(), self.combo())
+            elif self.accept("/"):
+                node = ast.BinOp(node, ast.Div(), self.combo())
+            elif self.starts_operand():
+                node = ast.BinOp(node, ast.Mult(), self.combo())
+            else:
+                return node
+
+    def combo(self):
+        node = self.unary()
+        while self.peek()[0] == "name" and self.peek()[1] in _COMBINATORICS:
+            name = self.advance()[1]
+            node = _call(name, node, self.unary())
+        return node
+
+    def unary(self):
+        if self.accept("-"):
+            return ast.UnaryOp(ast.USub(), self.unary())
+        if self.accept("+"):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        node = self.postfix()
+        if self.accept("^"):
+            node = ast.BinOp(node, ast.Pow(), self.unary())
+        return node
+
+    def postfix(self):
+        node = self.primary()
+        while True:
+            if self.accept("!"):
+                node = _call("fact", node)
+            elif self.accept("%"):
+                node = ast.BinOp(node, ast.Div(), ast.Constant(100))
+            elif self.accept("²"):
+                node = ast.BinOp(node, ast.Pow(), ast.Constant(2))
+            else:
+                return node
+
+    def primary(self):
+        kind, val = self.advance()
+        if kind == "num":
+            if self.exact:
+                # exact backends build their own number type from the literal text
+                return _call("_num", ast.Constant(val))
+            return ast.Constant(float(val) if any(c in val for c in ".eE") else int(val))
+        if kind == "name":
+            if self.accept("("):
+                args = []
+                if not self.accept(")"):
+                    args.append(self.expr())
+                    while self.accept(","):
+                        args.append(self.expr())
+                    self.close_paren()
+                return _call(val, *args)
+            return ast.Name(val, ast.Load())
+        if kind == "op" and val == "(":
+            node = self.expr()
+            self.close_paren()
+            return node
+        if kind == "op" and val == "√":
+            return _call("sqrt", self.postfix())
+        if kind == "end":
+            raise ExpressionError("Unexpected end of expression")
+        raise ExpressionError(f"Unexpected {val!r}")
+
+
+def _call(name, *args):
+    return ast.Call(ast.Name(name, ast.Load()), list(args), [])
+
+
+def parse(text, exact=False):
+    """Parse calculator syntax into a Python expression AST.
+
+    With ``exact=True`` number literals become ``_num("<literal>")`` calls
+    instead of float/int constants.
+    """
+    return _Parser(tokenize(text), exact).parse()
+
+
+def compile_tree(tree):
+    """Compile an expression AST into code that builds ``lambda Ans: ...``."""
+    fn = ast.Expression(ast.Lambda(
+        ast.arguments(posonlyargs=[], args=[ast.arg("Ans")], kwonlyargs=[],
+                      kw_defaults=[], defaults=[ast.Constant(0)]),
+        tree,
+    ))
+    return compile(ast.fix_missing_locations(fn), "<calc>", "eval")
+
+
+# --- Compiled expressions ---
+class CompiledExpression:
+    """A parsed expression compiled into a function of ``Ans``.
+
+    The compiled code is namespace-independent; ``bind`` attaches it to a
+    namespace (DEG, RAD, ...) once and reuses the resulting function.
+    """
+
+    __slots__ = ("text", "tree", "code", "names", "_bound")
+
+    def __init__(self, text):
+        self.text = text
+        self.tree = parse(text)
+        self.names = frozenset(n.id for n in ast.walk(self.tree) if isinstance(n, ast.Name))
+        self.code = compile_tree(self.tree)
+        self._bound = {}
+
+    def bind(self, namespace):
+        entry = self._bound.get(id(namespace))
+        if entry is None:
+            # keep a reference to the namespace so its id cannot be reused
+            entry = self._bound[id(namespace)] = (namespace, eval(self.code, namespace))
+        return entry[1]
+
+    def __call__(self, mode="DEG", ans=0):
+        return self.bind(_NAMESPACES[mode])(ans)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=1024)
+def _compile_normalized(text):
+    return CompiledExpression(text)
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(text):
+    """Return the (cached) compiled form of a calculator expression."""
+    return _compile_normalized(normalize(text))
+
+
+def evaluate(text, mode="DEG", ans=0):
+    """Evaluate a calculator expression in the given angle mode."""
+    return compile_expression(text)(mode, ans)
@@ -0,0 +1,137 @@
+"""
+calccore/history.py
+Bounded calculation history
+---------------------------
+Each session keeps its newest entries in a fixed-capacity ring buffer, so
+memory stays flat however long the session runs. Entries pushed out of the
+ring are optionally spilled to SQLite, and both tiers can be searched by
+expression prefix through a sorted in-memory index and a SQLite index.
+The SQLite connection is opened on the first spill, not per session, and
+released by close() (or ``with History() as h``) or when the History is
+garbage-collected, so a long-running server doesn't collect open handles.
+
+Set CALC_HISTORY_DB to a file path to enable spilling by default.
+"""
+
+import os
+import sqlite3
+import uuid
+import weakref
+from bisect import bisect_left, insort
+from collections import deque
+
+DEFAULT_CAPACITY = 50
+DEFAULT_SPILL_PATH = os.environ.get("CALC_HISTORY_DB")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    session TEXT NOT NULL,
+    seq     INTEGER NOT NULL,
+    expr    TEXT NOT NULL,
+    result
+);
+CREATE INDEX IF NOT EXISTS history_expr ON history (session, expr);
+"""
+
+
+def _sql_value(v):
+    if isinstance(v, float) or (isinstance(v, int) and -2**63 <= v < 2**63):
+        return v
+    return str(v)
+
+
+class History:
+    """Newest-first history of ``(expression, result)`` pairs."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_path=DEFAULT_SPILL_PATH, session=None):
+        self._items = deque(maxlen=capacity)  # (seq, expr, result), oldest first
+        self._index = []                      # sorted (expr, seq) of the ring
+        self._seq = 0
+        self.session = session or uuid.uuid4().hex
+        self.spill_path = spill_path
+        self._spilled = session is not None  # a named session may have rows already
+        self._db = None
+        self._release = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return ((expr, result) for _, expr, result in reversed(self._items))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _spill_db(self):
+        # Spill connection, opened on first use; None when spilling is off.
+        if self._db is None and self.spill_path:
+            self._db = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+            self._release = weakref.finalize(self, self._db.close)
+        return self._db
+
+    def add(self, expr, result):
+        if len(self._items) == self._items.maxlen:
+            seq, old_expr, old_result = self._items.popleft()
+            del self._index[bisect_left(self._index, (old_expr, seq))]
+            db = self._spill_db()
+            if db is not None:
+                with db:
+                    db.execute("INSERT INTO history VALUES (?, ?, ?, ?)",
+                               (self.session, seq, old_expr, _sql_value(old_result)))
+                self._spilled = True
+        self._seq += 1
+        self._items.append((self._seq, expr, result))
+        insort(self._index, (expr, self._seq))
+
+    def recent(self, n=20):
+        """The ``n`` newest entries, newest first."""
+        out = []
+        for i in range(len(self._items) - 1, max(len(self._items) - n, 0) - 1, -1):
+            _, expr, result = self._items[i]
+            out.append((expr, result))
+        return out
+
+    def search(self, prefix, limit=20):
+        """Entries whose expression starts with ``prefix``, newest first."""
+        lo = bisect_left(self._index, (prefix,))
+        seqs = []
+        for expr, seq in self._index[lo:]:
+            if not expr.startswith(prefix):
+                break
+            seqs.append(seq)
+        seqs.sort(reverse=True)
+        first = self._items[0][0] if self._items else 0
+        out = []
+        for seq in seqs[:limit]:
+            _, expr, result = self._items[seq - first]
+            out.append((expr, result))
+        if len(out) < limit and self._spilled and self._spill_db() is not None:
+            rows = self._db.execute(
+                "SELECT expr, result FROM history WHERE session = ? AND expr >= ? AND expr < ?"
+                " ORDER BY seq DESC LIMIT ?",
+                (self.session, prefix, prefix + "\U0010ffff", limit - len(out)),
+            )
+            out.extend(rows)
+        return out
+
+    def clear(self):
+        self._items.clear()
+        self._index.clear()
+        if self._spilled and self._spill_db() is not None:
+            with self._db:
+                self._db.execute("DELETE FROM history WHERE session = ?", (self.session,))
+            self._spilled = False
+
+    def close(self):
+        """Release the spill connection; a later spill reopens it."""
+        if self._release is not None:
+            self._release()
+            self._release = None
+        self._db = None
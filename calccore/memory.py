@@ -0,0 +1,21 @@
+"""
+calccore/memory.py
+Independent memory register (M+, M-, MR, MC)
+"""
+
+
+class Memory:
+    def __init__(self, value=0.0):
+        self.value = value
+
+    def add(self, x):
+        self.value += x
+
+    def subtract(self, x):
+        self.value -= x
+
+    def recall(self):
+        return self.value
+
+    def clear(self):
+        self.value = 0.0
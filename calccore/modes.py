@@ -0,0 +1,12 @@
+"""
+calccore/modes.py
+Angle modes
+"""
+
+DEG = "DEG"
+RAD = "RAD"
+ANGLE_MODES = (DEG, RAD)
+
+
+def toggle_mode(mode):
+    return RAD if mode == DEG else DEG
@@ -0,0 +1,233 @@
+"""
+calccore/sandbox.py
+Resource-bounded evaluation
+---------------------------
+``safe_evaluate`` runs an expression with guarded versions of the
+operations whose cost explodes with their inputs (^ / **, pow, !,
+factorial, nCr / comb, nPr / perm). Each guard estimates the bit length
+of its result before computing it:
+
+ - small results are computed inline, as usual
+ - results up to HARD_LIMIT_BITS are computed in a separate process that
+   is killed after ``timeout`` seconds and capped at ``memory_mb`` of
+   address space
+ - anything larger is rejected straight away with CostLimitError
+
+HARD_LIMIT_BITS follows Python's int-to-str limit (4,300 digits unless
+PYTHONINTMAXSTRDIGITS says otherwise): a bigger int can't be displayed,
+so it isn't worth computing. At the default that is below
+INLINE_LIMIT_BITS and everything runs inline; the subprocess only comes
+into play when the digit limit is raised.
+
+The same guards and limits apply to every number backend: with
+``backend="FRACTION"`` or ``"DECIMAL(n)"`` the backend's exact variant of
+the expression is guarded and run in that backend's namespace.
+
+Functions added with ``register_function`` are not visible inside the
+subprocess, which starts from a fresh interpreter.
+"""
+
+import ast
+import math
+import multiprocessing
+import numbers
+import sys
+from functools import lru_cache
+
+from . import engine
+from .backends import get_backend
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+INLINE_LIMIT_BITS = 1 << 17   # ~40k digits: computed in microseconds
+_MAX_STR_DIGITS = getattr(sys, "get_int_max_str_digits", lambda: 4300)()
+# ~14k bits at the default; 0 means unlimited, so keep ~5M digits then
+HARD_LIMIT_BITS = int(_MAX_STR_DIGITS / math.log10(2)) if _MAX_STR_DIGITS else 1 << 24
+DEFAULT_TIMEOUT = 5.0         # seconds
+DEFAULT_MEMORY_MB = 512
+
+_LN2 = math.log(2)
+
+
+class CostLimitError(ArithmeticError):
+    """Raised when an expression is too expensive to evaluate."""
+
+
+class EvaluationTimeout(CostLimitError):
+    """Raised when a subprocess evaluation exceeds its time budget."""
+
+
+class _Offload(Exception):
+    """Internal: the expression must be evaluated in a subprocess."""
+
+
+# In the parent process, costs above the inline limit are offloaded; the
+# subprocess computes anything up to HARD_LIMIT_BITS and must not offload again.
+_budget = {"offload": True}
+
+
+def _check(bits):
+    if bits > HARD_LIMIT_BITS:
+        raise CostLimitError(f"Result too large (about {int(bits * math.log10(2)):,} digits)")
+    if bits > INLINE_LIMIT_BITS and _budget["offload"]:
+        raise _Offload
+
+
+def _log2_factorial(n):
+    return math.lgamma(n + 1) / _LN2 if n > 1 else 0.0
+
+
+def _integral(x):
+    # Fraction / Decimal operands from the exact backends
+    if x != int(x):
+        raise ValueError("factorial() only accepts integral values")
+    return int(x)
+
+
+# --- Guarded operations ---
+def _guard_pow(a, b, *mod):
+    if not mod and isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        _check(math.log2(abs(a)) * b)
+    elif (not mod and isinstance(a, numbers.Rational) and isinstance(b, numbers.Rational)
+          and b.denominator == 1 and a not in (0, 1, -1)):
+        # Exact rationals grow in the numerator or, for b < 0, the denominator.
+        _check(max(math.log2(abs(a.numerator) or 1), math.log2(a.denominator)) * abs(int(b)))
+    return pow(a, b, *mod)
+
+
+def _guard_fact(n):
+    if not isinstance(n, (int, float)):
+        n = _integral(n)
+    if n > 0:
+        _check(_log2_factorial(n))
+    return math.factorial(n)
+
+
+def _guard_comb(n, r):
+    n, r = int(n), int(r)
+    if 0 <= r <= n:
+        _check(_log2_factorial(n) - _log2_factorial(r) - _log2_factorial(n - r))
+    return math.comb(n, r)
+
+
+def _guard_perm(n, r):
+    n, r = int(n), int(r)
+    if 0 <= r <= n:
+        _check(_log2_factorial(n) - _log2_factorial(n - r))
+    return math.perm(n, r)
+
+
+_GUARDS = {
+    "pow": "_guard_pow",
+    "fact": "_guard_fact",
+    "factorial": "_guard_fact",
+    "nCr": "_guard_comb",
+    "comb": "_guard_comb",
+    "nPr": "_guard_perm",
+    "perm": "_guard_perm",
+}
+
+_GUARD_FUNCTIONS = {
+    "_guard_pow": _guard_pow,
+    "_guard_fact": _guard_fact,
+    "_guard_comb": _guard_comb,
+    "_guard_perm": _guard_perm,
+}
+
+# Underscore names cannot be typed by users, so installing the guards in
+# the shared namespaces does not change what plain expressions can reach.
+for _ns in engine._NAMESPACES.values():
+    _ns.update(_GUARD_FUNCTIONS)
+
+
+class _GuardTransformer(ast.NodeTransformer):
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.Call(ast.Name("_guard_pow", ast.Load()), [node.left, node.right], [])
+        return node
+
+    def visit_Name(self, node):
+        if node.id in _GUARDS:
+            return ast.Name(_GUARDS[node.id], ast.Load())
+        return node
+
+
+@lru_cache(maxsize=1024)
+def _guarded_code(text, exact=False):
+    return engine.compile_tree(_GuardTransformer().visit(engine.parse(text, exact=exact)))
+
+
+# Exact backends keep their own copies of the namespaces, built before or
+# after this module was imported; each gets a guarded copy of its own,
+# refreshed like theirs when functions are registered.
+_exact_namespaces = {}
+
+
+def _guarded_namespace(backend, mode):
+    if not backend.exact:
+        return backend.namespace(mode)
+    key = (backend.name, mode)
+    ns = _exact_namespaces.get(key)
+    if ns is None:
+        ns = _exact_namespaces[key] = dict(backend.namespace(mode), **_GUARD_FUNCTIONS)
+    return engine.refresh_namespace(ns, mode)
+
+
+def _evaluate_guarded(text, mode, ans, backend="FLOAT"):
+    backend = get_backend(backend)
+    return backend.run(_guarded_code(text, backend.exact), _guarded_namespace(backend, mode), ans)
+
+
+# --- Subprocess evaluation ---
+def _child(conn, text, mode, ans, memory_mb, backend, hard_limit):
+    global HARD_LIMIT_BITS
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # the parent's limit, even where this interpreter's digit limit differs
+    HARD_LIMIT_BITS = hard_limit
+    _budget["offload"] = False
+    try:
+        conn.send((True, _evaluate_guarded(text, mode, ans, backend)))
+    except BaseException as e:
+        conn.send((False, e))
+    finally:
+        conn.close()
+
+
+def _evaluate_in_subprocess(text, mode, ans, timeout, memory_mb, backend):
+    # spawn, not fork: the Streamlit server is multi-threaded
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    args = (child_conn, text, mode, ans, memory_mb, backend, HARD_LIMIT_BITS)
+    proc = ctx.Process(target=_child, args=args, daemon=True)
+    proc.start()
+    child_conn.close()
+    try:
+        if not parent_conn.poll(timeout):
+            raise EvaluationTimeout(f"Evaluation took longer than {timeout:g}s")
+        ok, value = parent_conn.recv()
+    except EOFError:
+        raise CostLimitError("Evaluation ran out of memory") from None
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        parent_conn.close()
+    if not ok:
+        raise value
+    return value
+
+
+def safe_evaluate(text, mode="DEG", ans=0, timeout=DEFAULT_TIMEOUT, memory_mb=DEFAULT_MEMORY_MB,
+                  backend="FLOAT"):
+    """Evaluate an expression without letting it stall the calling worker."""
+    text = engine.normalize(text)
+    try:
+        return _evaluate_guarded(text, mode, ans, backend)
+    except _Offload:
+        return _evaluate_in_subprocess(text, mode, ans, timeout, memory_mb, backend)
@@ -1,72 +1,29 @@
 import streamlit as st
-import math
+from calccore import Calculator
+from calccore.backends import BACKEND_CHOICES
+from keypad import keypad
 
 # ---- PAGE CONFIG ----
 st.set_page_config(page_title="Casio fx-991 • Scientific Calculator", page_icon="🧮", layout="centered")
 
 # ---- SESSION STATE ----
-if "expr" not in st.session_state:
-    st.session_state.expr = ""
-if "mode" not in st.session_state:
-    st.session_state.mode = "DEG"
-if "memory" not in st.session_state:
-    st.session_state.memory = 0.0
-if "ans" not in st.session_state:
-    st.session_state.ans = 0.0
-if "history" not in st.session_state:
-    st.session_state.history = []
+# All calculator state and key handling lives in calccore.Calculator;
+# this script only draws widgets and forwards key presses to it.
+if "calc" not in st.session_state:
+    st.session_state.calc = Calculator()
+if "backend" not in st.session_state:
+    st.session_state.backend = st.session_state.calc.backend
+calc = st.session_state.calc
 
 # ---- FUNCTIONS ----
-def append(value): 
-    st.session_state.expr += value
-
-def clear(): 
-    st.session_state.expr = ""
-
-def delete(): 
-    st.session_state.expr = st.session_state.expr[:-1]
-
-def tsin(x): 
-    return math.sin(math.radians(x)) if st.session_state.mode=="DEG" else math.sin(x)
-
-def tcos(x): 
-    return math.cos(math.radians(x)) if st.session_state.mode=="DEG" else math.cos(x)
-
-def ttan(x): 
-    return math.tan(math.radians(x)) if st.session_state.mode=="DEG" else math.tan(x)
-
-def nPr(n, r): 
-    return math.factorial(int(n)) // math.factorial(int(n) - int(r))
-
-def nCr(n, r): 
-    return math.comb(int(n), int(r))
-
-def evaluate_expression(expr: str):
-    try:
-        expr = expr.replace("×","*").replace("÷","/").replace("^","**").replace("%","/100")
-        expr = expr.replace("√","math.sqrt").replace("π","math.pi").replace("e","math.e")
-        expr = expr.replace("sin","tsin").replace("cos","tcos").replace("tan","ttan")
-        expr = expr.replace("ln","math.log").replace("log","math.log10")
-        expr = expr.replace("nPr","nPr").replace("nCr","nCr")
-        expr = expr.replace("Ans", str(st.session_state.ans))
-        result = eval(expr, {"math": math, "tsin": tsin, "tcos": tcos, "ttan": ttan, "nPr": nPr, "nCr": nCr})
-        st.session_state.ans = result
-        st.session_state.history.insert(0, (st.session_state.expr, result))
-        st.session_state.expr = str(result)
-    except Exception as e:
-        st.error(f"Error: {e}")
+def set_backend():
+    calc.backend = st.session_state.backend
 
 # ---- HEADER ----
 st.title("🧮 Casio fx-991 Style Scientific Calculator")
 
-col1, col2 = st.columns([3,1])
-with col1:
-    st.text_input("Expression", key="expr", label_visibility="hidden")
-with col2:
-    if st.button(st.session_state.mode):
-        st.session_state.mode = "RAD" if st.session_state.mode == "DEG" else "DEG"
-
-st.caption(f"Memory: {round(st.session_state.memory,6)} | Ans: {round(st.session_state.ans,6)}")
+st.selectbox("Number mode", BACKEND_CHOICES, key="backend", on_change=set_backend,
+             help="DECIMAL and FRACTION give exact decimal/rational answers")
 
 # ---- BUTTON LAYOUT ----
 rows = [
@@ -80,54 +37,32 @@ rows = [
     ["nCr","nPr","x²","^","!"]
 ]
 
-# ---- BUTTON ACTIONS ----
-def handle_button(label):
-    if label == "AC":
-        clear()
-    elif label == "DEL":
-        delete()
-    elif label == "=":
-        evaluate_expression(st.session_state.expr)
-    elif label == "√":
-        append("√(")
-    elif label == "x²":
-        append("**2")
-    elif label == "±":
-        append("(-")
-    elif label == "!":
-        append("math.factorial(")
-    elif label == "M+":
-        try:
-            st.session_state.memory += float(eval(st.session_state.expr or "0"))
-        except:
-            pass
-    elif label == "M-":
-        try:
-            st.session_state.memory -= float(eval(st.session_state.expr or "0"))
-        except:
-            pass
-    elif label == "MR":
-        append(str(st.session_state.memory))
-    elif label == "MC":
-        st.session_state.memory = 0
-    else:
-        append(label)
-
-# ---- BUTTON GRID ----
-for row in rows:
-    cols = st.columns(5)
-    for i, label in enumerate(row):
-        if cols[i].button(label, use_container_width=True):
-            handle_button(label)
-            st.experimental_rerun()  # ✅ safer rerun than st.rerun()
-
-# ---- HISTORY ----
-with st.expander("🧾 History"):
-    if not st.session_state.history:
-        st.write("No calculations yet.")
-    else:
-        for expr, res in st.session_state.history[:20]:
-            st.code(f"{expr} = {res}")
+# ---- CALCULATOR ----
+# The expression is edited in the browser; only "=", the memory keys and
+# the mode button come back here, and they rerun just this fragment.
+@st.fragment
+def calculator():
+    col1, col2 = st.columns([3,1])
+    with col1:
+        st.caption(f"Memory: {round(calc.memory.value,6)} | Ans: {round(calc.ans,6)}")
+    with col2:
+        st.button(calc.mode, on_click=calc.toggle_mode)
+    if calc.error:
+        st.error(f"Error: {calc.error}")
+
+    keypad(calc, rows)
+
+    # ---- HISTORY ----
+    with st.expander("🧾 History"):
+        if not calc.history:
+            st.write("No calculations yet.")
+        else:
+            query = st.text_input("Search history", key="history_query", placeholder="Expression starts with...")
+            found = calc.history.search(query) if query else calc.history.recent(20)
+            for expr, res in found:
+                st.code(f"{expr} = {res}")
+
+calculator()
 
 st.markdown("---")
 st.markdown("""
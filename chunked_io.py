@@ -0,0 +1,103 @@
+"""
+chunked_io.py
+Chunked CSV / Parquet reading and writing
+-----------------------------------------
+Shared by the bulk trade import (portfolio_io.py) and the batch risk
+scorer (riskcore/batch.py). Files are read and written one DataFrame
+chunk at a time, so memory use is bounded by the chunk size, not the
+file.
+
+Types stay the same from chunk to chunk. read_chunks() reads CSV columns
+with fixed dtypes, and columns it isn't told about pass through as text.
+FrameWriter casts every chunk to the schema of the first one.
+
+Needs pandas, plus pyarrow for Parquet.
+"""
+
+import os
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def file_format(path):
+    """"parquet" for .parquet / .pq paths, "csv" otherwise."""
+    ext = os.path.splitext(str(path))[1].lower()
+    return "parquet" if ext in (".parquet", ".pq") else "csv"
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE, dtype=None, **csv_options):
+    """Yield DataFrame chunks of a CSV or Parquet file.
+
+    CSV columns get their type from ``dtype`` (column -> dtype) and are
+    read as str otherwise; Parquet files carry their own schema.
+    """
+    import pandas as pd
+
+    if file_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        dtype = dtype or {}
+        columns = pd.read_csv(path, nrows=0).columns
+        yield from pd.read_csv(path, chunksize=chunksize,
+                               dtype={c: dtype.get(c, str) for c in columns}, **csv_options)
+
+
+class FrameWriter:
+    """Append DataFrames to one CSV or Parquet file.
+
+    CSV goes through pyarrow's writer when it is installed; it is about
+    ten times faster than DataFrame.to_csv on float-heavy frames. Every
+    chunk is cast to the first chunk's schema, which the file is created
+    with; columns that were all blank in the first chunk are written as
+    strings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.schema = None
+        self._writer = None
+
+    def _arrow_writer(self, schema):
+        import pyarrow.csv as pcsv
+        import pyarrow.parquet as pq
+
+        if file_format(self.path) == "parquet":
+            return pq.ParquetWriter(self.path, schema)
+        return pcsv.CSVWriter(self.path, schema,
+                              write_options=pcsv.WriteOptions(quoting_style="needed"))
+
+    def write(self, frame):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            if file_format(self.path) == "parquet":
+                raise
+            frame.to_csv(self.path, mode="w" if self.rows == 0 else "a",
+                         header=self.rows == 0, index=False)
+        else:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self.schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                         for f in table.schema], metadata=table.schema.metadata)
+                self._writer = self._arrow_writer(self.schema)
+            if not table.schema.equals(self.schema):
+                # Types inferred per chunk drift: an int column that gains a
+                # blank becomes double, an all-blank one becomes null.
+                table = table.cast(self.schema)
+            self._writer.write_table(table)
+        self.rows += len(frame)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
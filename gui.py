@@ -5,17 +5,21 @@ Professional Investment Return Calculator (Tkinter)
 Features:
  - Calculates Simple Return, Annualized Return, and CAGR
  - Light/Dark Theme toggle
- - Matplotlib charts (Pie, Line, Bar)
+ - Matplotlib charts (Pie, Line, Bar, Scenario Heatmap)
  - Responsive / Resizable layout
- - CSV Export
+ - CSV / Parquet export and bulk trade import
  - Example Loader & Clear button
+ - Live update mode (debounced, charts rendered off the UI thread)
  - Works on Python 3.10 – 3.13 without errors
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import returns
 
 # --- Matplotlib Safe Import ---
 try:
@@ -23,11 +27,18 @@ try:
     matplotlib.use("TkAgg")
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
     from matplotlib.figure import Figure
-    import numpy as np
+    from investment_charts import ReturnCharts
     MPL_AVAILABLE = True
 except Exception:
     MPL_AVAILABLE = False
 
+# --- Bulk I/O Safe Import (NumPy; pandas/pyarrow only when a file is read) ---
+try:
+    import portfolio_io
+    IO_AVAILABLE = True
+except Exception:
+    IO_AVAILABLE = False
+
 
 # --- Helpers ---
 def safe_float(s):
@@ -38,7 +49,13 @@ def safe_float(s):
 
 
 # --- Core Computation ---
-def compute_returns():
+def input_error(title, message, live):
+    # Live mode sees half-typed numbers all the time; only Compute complains.
+    if not live:
+        messagebox.showerror(title, message)
+
+
+def compute_returns(live=False):
     n = safe_float(ent_shares.get())
     bp = safe_float(ent_buy_price.get())
     bc = safe_float(ent_buy_comm.get())
@@ -56,102 +73,142 @@ def compute_returns():
         ("Holding period", hp)
     ] if val is None]
     if missing:
-        messagebox.showerror("Input Error", "Please fill: " + ", ".join(missing))
+        input_error("Input Error", "Please fill: " + ", ".join(missing), live)
         return
-    if n <= 0 or bp < 0 or sp < 0 or hp <= 0:
-        messagebox.showerror("Input Error", "Invalid numeric entries.")
+    try:
+        results = returns.compute(n, bp, bc, sp, sc, dv, hp, unit)
+    except returns.InputError as e:
+        input_error("Input Error", str(e), live)
         return
 
-    years = hp / 12 if unit == "months" else hp
-    months = hp if unit == "months" else hp * 12
-    BV = n * bp + bc
-    EV = n * sp - sc + n * dv
-
-    if BV <= 0:
-        messagebox.showerror("Error", "Beginning value cannot be zero.")
-        return
+    lbl_bv.config(text=f"₹{results['BV']:,.2f}")
+    lbl_ev.config(text=f"₹{results['EV']:,.2f}")
+    lbl_simple.config(text=f"{results['simple']*100:.2f}%")
+    lbl_annual.config(text=f"{results['annual']*100:.2f}%")
+    lbl_cagr.config(text=f"{results['cagr']*100:.2f}%")
 
-    simple = (EV - BV) / BV
-    annual = simple / months * 12 if months > 0 else 0
-    cagr = (EV / BV) ** (1 / years) - 1 if years > 0 and EV > 0 and BV > 0 else 0
-
-    lbl_bv.config(text=f"₹{BV:,.2f}")
-    lbl_ev.config(text=f"₹{EV:,.2f}")
-    lbl_simple.config(text=f"{simple*100:.2f}%")
-    lbl_annual.config(text=f"{annual*100:.2f}%")
-    lbl_cagr.config(text=f"{cagr*100:.2f}%")
-
-    results = dict(
-        BV=BV, EV=EV, n=n, bp=bp, sp=sp, bc=bc, sc=sc, dv=dv,
-        months=months, years=years,
-        simple=simple, annual=annual, cagr=cagr
-    )
+    global last_result
+    last_result = results
     if MPL_AVAILABLE:
-        update_charts(results)
+        if live:
+            render_live(results)
+        else:
+            update_charts(results)
 
 
 # --- Chart Rendering ---
+def visible_tab():
+    return nb.index(nb.select())
+
+
 def update_charts(r):
-    for fig in [fig_pie, fig_line, fig_bar]:
-        fig.clear()
-
-    # PIE
-    axp = fig_pie.add_subplot(111)
-    labels = ["Beginning Value", "Profit" if r["EV"] >= r["BV"] else "Loss", "Dividends"]
-    sizes = [r["BV"], abs(r["EV"] - r["BV"]), r["n"] * r["dv"]]
-    axp.pie(sizes, labels=labels, autopct="%1.1f%%", startangle=90)
-    axp.set_title("Portfolio Breakdown")
-
-    # LINE
-    axl = fig_line.add_subplot(111)
-    t = np.linspace(0, r["months"], 50)
-    lin = r["BV"] + (r["EV"] - r["BV"]) * (t / r["months"])
-    comp = r["BV"] * ((1 + r["cagr"]) ** (t / 12)) if r["cagr"] else lin
-    axl.plot(t, lin, label="Linear")
-    axl.plot(t, comp, label="Compound", linestyle="--")
-    axl.set_title("Value Over Time")
-    axl.legend()
-    axl.grid(True, alpha=0.3)
-
-    # BAR
-    axb = fig_bar.add_subplot(111)
-    lbls = ["Simple", "Annualized", "CAGR"]
-    vals = [r["simple"] * 100, r["annual"] * 100, r["cagr"] * 100]
-    axb.bar(lbls, vals)
-    axb.set_title("Return Comparison")
-    for i, v in enumerate(vals):
-        axb.text(i, v, f"{v:.2f}%", ha="center", va="bottom")
-
-    canvas_pie.draw()
-    canvas_line.draw()
-    canvas_bar.draw()
-
-
-# --- CSV Export ---
+    charts.update(r, visible_tab())
+
+
+# --- Live Mode ---
+# Entry edits are debounced with root.after; the visible chart is then
+# rasterized on a worker thread and only blitted here on the Tk thread.
+LIVE_DELAY_MS = 250
+LIVE_POLL_MS = 15
+live_job = None
+live_generation = 0
+render_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def schedule_live(*_):
+    global live_job
+    if not live_var.get():
+        return
+    if live_job is not None:
+        root.after_cancel(live_job)
+    live_job = root.after(LIVE_DELAY_MS, run_live)
+
+
+def run_live():
+    global live_job
+    live_job = None
+    compute_returns(live=True)
+
+
+def render_live(r):
+    global live_generation
+    live_generation += 1
+    charts.prepare(r)
+    future = render_pool.submit(charts.render, visible_tab())
+    root.after(LIVE_POLL_MS, finish_live, future, live_generation)
+
+
+def finish_live(future, generation):
+    if not future.done():
+        root.after(LIVE_POLL_MS, finish_live, future, generation)
+        return
+    # A newer render has been queued; skip this now-stale frame.
+    if generation == live_generation:
+        future.result().blit()
+
+
+# --- Import / Export ---
+# Files hold raw numbers in portfolio_io's trade-file layout, so an
+# exported result can be fed straight back into a bulk import.
+FILE_TYPES = [("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
+IO_POLL_MS = 100
+last_result = None
+io_pool = ThreadPoolExecutor(max_workers=1)
+
+
+def io_unavailable():
+    if not IO_AVAILABLE:
+        messagebox.showerror("Unavailable", "NumPy is required for import/export.")
+    return not IO_AVAILABLE
+
+
 def export_csv():
-    if lbl_bv.cget("text") == "—":
+    if io_unavailable():
+        return
+    if last_result is None:
         messagebox.showinfo("Nothing to export", "Please compute first.")
         return
-    file = filedialog.asksaveasfilename(
-        defaultextension=".csv",
-        filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-    )
+    file = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES)
     if not file:
         return
     try:
-        with open(file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Metric", "Value"])
-            writer.writerow(["BV", lbl_bv.cget("text")])
-            writer.writerow(["EV", lbl_ev.cget("text")])
-            writer.writerow(["Simple Return", lbl_simple.cget("text")])
-            writer.writerow(["Annualized Return", lbl_annual.cget("text")])
-            writer.writerow(["CAGR", lbl_cagr.cget("text")])
+        portfolio_io.export_result(last_result, file, holding_unit_var.get())
         messagebox.showinfo("Export Successful", f"Saved to:\n{file}")
     except Exception as e:
         messagebox.showerror("Export Error", str(e))
 
 
+def import_trades():
+    if io_unavailable():
+        return
+    src = filedialog.askopenfilename(title="Trades to import", filetypes=FILE_TYPES)
+    if not src:
+        return
+    dst = filedialog.asksaveasfilename(title="Save results as", defaultextension=".csv",
+                                       filetypes=FILE_TYPES)
+    if not dst:
+        return
+    # Large files take a while; keep the window responsive meanwhile.
+    btn_import.config(state="disabled", text="Importing…")
+    started = time.perf_counter()
+    future = io_pool.submit(portfolio_io.process_file, src, dst)
+    root.after(IO_POLL_MS, finish_import, future, dst, started)
+
+
+def finish_import(future, dst, started):
+    if not future.done():
+        root.after(IO_POLL_MS, finish_import, future, dst, started)
+        return
+    btn_import.config(state="normal", text="Import Trades…")
+    try:
+        rows = future.result()
+    except Exception as e:
+        messagebox.showerror("Import Error", str(e))
+        return
+    messagebox.showinfo("Import Successful",
+                        f"Computed {rows:,} trades in {time.perf_counter() - started:.1f} s.\nSaved to:\n{dst}")
+
+
 # --- Utility ---
 def load_example():
     ent_shares.delete(0, tk.END); ent_shares.insert(0, "150")
@@ -171,11 +228,10 @@ def clear_all():
     holding_unit_var.set("months")
     for l in [lbl_bv, lbl_ev, lbl_simple, lbl_annual, lbl_cagr]:
         l.config(text="—")
+    global last_result
+    last_result = None
     if MPL_AVAILABLE:
-        for fig in [fig_pie, fig_line, fig_bar]:
-            fig.clear()
-        for c in [canvas_pie, canvas_line, canvas_bar]:
-            c.draw()
+        charts.clear(visible_tab())
 
 
 def toggle_theme():
@@ -188,102 +244,124 @@ def toggle_theme():
 
 
 # --- GUI Setup ---
-root = tk.Tk()
-root.title("Investment Return Calculator — Tkinter Edition")
-root.geometry("1100x700")
-root.minsize(900, 600)
-style = ttk.Style(root)
-style.theme_use("clam")
-
-# --- Layout ---
-main = ttk.Frame(root, padding=10)
-main.pack(fill="both", expand=True)
-
-left = ttk.Frame(main)
-left.pack(side="left", fill="y", padx=(0, 10))
-
-right = ttk.Frame(main)
-right.pack(side="right", fill="both", expand=True)
-
-# --- Inputs ---
-ttk.Label(left, text="Inputs", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(0, 6))
-
-def add_input(label):
-    ttk.Label(left, text=label).pack(anchor="w")
-    ent = ttk.Entry(left, width=20)
-    ent.pack(anchor="w", pady=(0, 4))
-    return ent
-
-ent_shares = add_input("No. of shares")
-ent_buy_price = add_input("Purchase price/share (₹)")
-ent_buy_comm = add_input("Purchase commission (₹)")
-ent_sell_price = add_input("Selling price/share (₹)")
-ent_sell_comm = add_input("Selling commission (₹)")
-ent_dividend = add_input("Dividend/share (₹)")
-
-ttk.Label(left, text="Holding period").pack(anchor="w")
-ent_holding = ttk.Entry(left, width=10)
-ent_holding.pack(side="left")
-holding_unit_var = tk.StringVar(value="months")
-ttk.OptionMenu(left, holding_unit_var, "months", "months", "years").pack(side="left", padx=4)
-
-# Buttons
-ttk.Button(left, text="Compute", command=compute_returns).pack(fill="x", pady=3)
-ttk.Button(left, text="Load Example", command=load_example).pack(fill="x", pady=3)
-ttk.Button(left, text="Clear", command=clear_all).pack(fill="x", pady=3)
-
-# --- Results ---
-ttk.Separator(left, orient="horizontal").pack(fill="x", pady=10)
-ttk.Label(left, text="Results", font=("Segoe UI", 12, "bold")).pack(anchor="w")
-
-def result_row(label):
-    ttk.Label(left, text=label).pack(anchor="w")
-    val = ttk.Label(left, text="—")
-    val.pack(anchor="w", pady=(0, 3))
-    return val
-
-lbl_bv = result_row("Beginning Value (BV):")
-lbl_ev = result_row("Ending Value (EV):")
-lbl_simple = result_row("Simple Return:")
-lbl_annual = result_row("Annualized Return:")
-lbl_cagr = result_row("CAGR:")
-
-# Export + Theme
-theme_var = tk.StringVar(value="Light")
-ttk.Button(left, text="Export CSV", command=export_csv).pack(fill="x", pady=4)
-ttk.Button(left, text="Toggle Theme", command=toggle_theme).pack(fill="x")
-
-# --- Charts ---
-if MPL_AVAILABLE:
-    nb = ttk.Notebook(right)
-    nb.pack(fill="both", expand=True)
-
-    tab1 = ttk.Frame(nb)
-    tab2 = ttk.Frame(nb)
-    tab3 = ttk.Frame(nb)
-    nb.add(tab1, text="Breakdown (Pie)")
-    nb.add(tab2, text="Growth (Line)")
-    nb.add(tab3, text="Comparison (Bar)")
-
-    fig_pie, fig_line, fig_bar = Figure(figsize=(4, 3), dpi=100), Figure(figsize=(5, 3), dpi=100), Figure(figsize=(4, 3), dpi=100)
-    canvas_pie = FigureCanvasTkAgg(fig_pie, tab1)
-    canvas_pie.get_tk_widget().pack(fill="both", expand=True)
-    NavigationToolbar2Tk(canvas_pie, tab1).update()
-
-    canvas_line = FigureCanvasTkAgg(fig_line, tab2)
-    canvas_line.get_tk_widget().pack(fill="both", expand=True)
-    NavigationToolbar2Tk(canvas_line, tab2).update()
-
-    canvas_bar = FigureCanvasTkAgg(fig_bar, tab3)
-    canvas_bar.get_tk_widget().pack(fill="both", expand=True)
-    NavigationToolbar2Tk(canvas_bar, tab3).update()
-else:
-    ttk.Label(right, text="Matplotlib not available — charts disabled.", foreground="red").pack(fill="both", expand=True)
-
-# --- Footer ---
-ttk.Label(root, text="Formulas: Simple=(EV−BV)/BV, Annualized=Simple×(12/months), CAGR=(EV/BV)^(1/years)−1",
-          font=("Segoe UI", 8), wraplength=900).pack(pady=(4, 6))
-
-# Start clean
-clear_all()
-root.mainloop()
+# Only when run as a program: importing this module must not need a display.
+# The math lives in returns.py for headless use.
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Investment Return Calculator — Tkinter Edition")
+    root.geometry("1100x700")
+    root.minsize(900, 600)
+    style = ttk.Style(root)
+    style.theme_use("clam")
+
+    # --- Layout ---
+    main = ttk.Frame(root, padding=10)
+    main.pack(fill="both", expand=True)
+
+    left = ttk.Frame(main)
+    left.pack(side="left", fill="y", padx=(0, 10))
+
+    right = ttk.Frame(main)
+    right.pack(side="right", fill="both", expand=True)
+
+    # --- Inputs ---
+    ttk.Label(left, text="Inputs", font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=(0, 6))
+
+    def add_input(label):
+        ttk.Label(left, text=label).pack(anchor="w")
+        ent = ttk.Entry(left, width=20)
+        ent.pack(anchor="w", pady=(0, 4))
+        ent.bind("<KeyRelease>", schedule_live)
+        return ent
+
+    ent_shares = add_input("No. of shares")
+    ent_buy_price = add_input("Purchase price/share (₹)")
+    ent_buy_comm = add_input("Purchase commission (₹)")
+    ent_sell_price = add_input("Selling price/share (₹)")
+    ent_sell_comm = add_input("Selling commission (₹)")
+    ent_dividend = add_input("Dividend/share (₹)")
+
+    ttk.Label(left, text="Holding period").pack(anchor="w")
+    ent_holding = ttk.Entry(left, width=10)
+    ent_holding.pack(side="left")
+    ent_holding.bind("<KeyRelease>", schedule_live)
+    holding_unit_var = tk.StringVar(value="months")
+    holding_unit_var.trace_add("write", schedule_live)
+    ttk.OptionMenu(left, holding_unit_var, "months", "months", "years").pack(side="left", padx=4)
+
+    # Buttons
+    ttk.Button(left, text="Compute", command=compute_returns).pack(fill="x", pady=3)
+    live_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(left, text="Live update", variable=live_var, command=schedule_live).pack(anchor="w", pady=3)
+    ttk.Button(left, text="Load Example", command=load_example).pack(fill="x", pady=3)
+    ttk.Button(left, text="Clear", command=clear_all).pack(fill="x", pady=3)
+
+    # --- Results ---
+    ttk.Separator(left, orient="horizontal").pack(fill="x", pady=10)
+    ttk.Label(left, text="Results", font=("Segoe UI", 12, "bold")).pack(anchor="w")
+
+    def result_row(label):
+        ttk.Label(left, text=label).pack(anchor="w")
+        val = ttk.Label(left, text="—")
+        val.pack(anchor="w", pady=(0, 3))
+        return val
+
+    lbl_bv = result_row("Beginning Value (BV):")
+    lbl_ev = result_row("Ending Value (EV):")
+    lbl_simple = result_row("Simple Return:")
+    lbl_annual = result_row("Annualized Return:")
+    lbl_cagr = result_row("CAGR:")
+
+    # Export + Theme
+    theme_var = tk.StringVar(value="Light")
+    ttk.Button(left, text="Export CSV", command=export_csv).pack(fill="x", pady=4)
+    btn_import = ttk.Button(left, text="Import Trades…", command=import_trades)
+    btn_import.pack(fill="x", pady=(0, 4))
+    ttk.Button(left, text="Toggle Theme", command=toggle_theme).pack(fill="x")
+
+    # --- Charts ---
+    if MPL_AVAILABLE:
+        nb = ttk.Notebook(right)
+        nb.pack(fill="both", expand=True)
+
+        tab1 = ttk.Frame(nb)
+        tab2 = ttk.Frame(nb)
+        tab3 = ttk.Frame(nb)
+        tab4 = ttk.Frame(nb)
+        nb.add(tab1, text="Breakdown (Pie)")
+        nb.add(tab2, text="Growth (Line)")
+        nb.add(tab3, text="Comparison (Bar)")
+        nb.add(tab4, text="Scenarios (Heatmap)")
+
+        fig_pie, fig_line, fig_bar = Figure(figsize=(4, 3), dpi=100), Figure(figsize=(5, 3), dpi=100), Figure(figsize=(4, 3), dpi=100)
+        canvas_pie = FigureCanvasTkAgg(fig_pie, tab1)
+        canvas_pie.get_tk_widget().pack(fill="both", expand=True)
+        NavigationToolbar2Tk(canvas_pie, tab1).update()
+
+        canvas_line = FigureCanvasTkAgg(fig_line, tab2)
+        canvas_line.get_tk_widget().pack(fill="both", expand=True)
+        NavigationToolbar2Tk(canvas_line, tab2).update()
+
+        canvas_bar = FigureCanvasTkAgg(fig_bar, tab3)
+        canvas_bar.get_tk_widget().pack(fill="both", expand=True)
+        NavigationToolbar2Tk(canvas_bar, tab3).update()
+
+        fig_heatmap = Figure(figsize=(5, 3), dpi=100, layout="constrained")
+        canvas_heatmap = FigureCanvasTkAgg(fig_heatmap, tab4)
+        canvas_heatmap.get_tk_widget().pack(fill="both", expand=True)
+        NavigationToolbar2Tk(canvas_heatmap, tab4).update()
+
+        # Charts keep their artists and only redraw the tab on screen;
+        # hidden tabs catch up when selected.
+        charts = ReturnCharts(canvas_pie, canvas_line, canvas_bar, canvas_heatmap)
+        nb.bind("<<NotebookTabChanged>>", lambda e: charts.show(visible_tab()))
+    else:
+        ttk.Label(right, text="Matplotlib not available — charts disabled.", foreground="red").pack(fill="both", expand=True)
+
+    # --- Footer ---
+    ttk.Label(root, text="Formulas: Simple=(EV−BV)/BV, Annualized=Simple×(12/months), CAGR=(EV/BV)^(1/years)−1",
+              font=("Segoe UI", 8), wraplength=900).pack(pady=(4, 6))
+
+    # Start clean
+    clear_all()
+    root.mainloop()
@@ -0,0 +1,252 @@
+"""
+investment_charts.py
+Charts for the Investment Return Calculator
+-------------------------------------------
+The pie, line and bar charts are built once with placeholder data; each
+Compute only moves the existing artists (wedge angles, line data, bar
+heights and their labels). Only the chart on screen is redrawn; the
+others are marked stale and brought up to date when their tab is shown.
+
+An optional fourth canvas shows a scenario heatmap: CAGR over a grid of
+buy and sell prices around the current inputs, computed by scenarios.py.
+
+For live updates render() does the Agg rasterization on a worker thread,
+leaving only the canvas blit() for the UI thread. Matplotlib isn't
+thread-safe, so the canvas's draw() and blit() (draw_idle and toolbar
+redraws go through them) and, on a Tk canvas, the window events that
+resize the figure or pan/zoom its axes take the same lock as render().
+
+Works with any matplotlib canvas, so it needs no Tk of its own.
+"""
+
+import math
+import threading
+
+import numpy as np
+
+import scenarios
+
+LINE_POINTS = 50
+PIE_LABEL_DISTANCE = 1.1
+PIE_PCT_DISTANCE = 0.6
+BAR_LABELS = ["Simple", "Annualized", "CAGR"]
+HEATMAP_STEPS = 41
+HEATMAP_SPREAD = 0.3  # sweep each price ±30% around its current value
+
+# Canvas methods that draw or change the figure from the UI thread, and
+# the Tk events FigureCanvasTk binds to them when it is created.
+LOCKED_METHODS = ("draw", "blit", "resize", "_update_device_pixel_ratio", "motion_notify_event",
+                  "button_press_event", "button_release_event", "button_dblclick_event", "scroll_event")
+TK_EVENTS = {
+    "<Configure>": "resize",
+    "<Map>": "_update_device_pixel_ratio",
+    "<Motion>": "motion_notify_event",
+    **{f"<Button-{b}>": "button_press_event" for b in (1, 2, 3)},
+    **{f"<ButtonRelease-{b}>": "button_release_event" for b in (1, 2, 3)},
+    **{f"<Double-Button-{b}>": "button_dblclick_event" for b in (1, 2, 3)},
+    **{f"<Button-{b}>": "scroll_event" for b in (4, 5)},
+}
+
+
+def _pie_labels(r):
+    return ["Beginning Value", "Profit" if r["EV"] >= r["BV"] else "Loss", "Dividends"]
+
+
+def _pie_sizes(r):
+    return [r["BV"], abs(r["EV"] - r["BV"]), max(r["n"] * r["dv"], 0.0)]
+
+
+def _growth(r, t):
+    lin = r["BV"] + (r["EV"] - r["BV"]) * (t / r["months"])
+    comp = r["BV"] * ((1 + r["cagr"]) ** (t / 12)) if r["cagr"] else lin
+    return lin, comp
+
+
+def _bar_values(r):
+    return [r["simple"] * 100, r["annual"] * 100, r["cagr"] * 100]
+
+
+def _price_range(price):
+    span = abs(price) * HEATMAP_SPREAD or 1.0
+    return max(price - span, 0.0), price + span
+
+
+def _heatmap(r):
+    bp_lo, bp_hi = _price_range(r["bp"])
+    sp_lo, sp_hi = _price_range(r["sp"])
+    base = dict(n=r["n"], bc=r["bc"], sc=r["sc"], dv=r["dv"], hp=r["months"])
+    sweep = scenarios.grid(base, bp=np.linspace(bp_lo, bp_hi, HEATMAP_STEPS),
+                           sp=np.linspace(sp_lo, sp_hi, HEATMAP_STEPS))
+    return sweep["cagr"] * 100, (sp_lo, sp_hi, bp_lo, bp_hi)
+
+
+class ReturnCharts:
+    """Pie, line, bar and optional heatmap charts of one result, one per canvas."""
+
+    def __init__(self, canvas_pie, canvas_line, canvas_bar, canvas_heatmap=None):
+        self.canvases = [canvas_pie, canvas_line, canvas_bar]
+        self.axes = []
+        self.result = None
+        self.lock = threading.RLock()
+        self._build_pie(canvas_pie.figure)
+        self._build_line(canvas_line.figure)
+        self._build_bar(canvas_bar.figure)
+        self._updaters = [self._update_pie, self._update_line, self._update_bar]
+        if canvas_heatmap is not None:
+            self.canvases.append(canvas_heatmap)
+            self._build_heatmap(canvas_heatmap.figure)
+            self._updaters.append(self._update_heatmap)
+        self._stale = [False] * len(self.canvases)
+        for canvas in self.canvases:
+            self._serialize(canvas)
+        self._set_visible(False)
+
+    def _serialize(self, canvas):
+        # Route the canvas's own drawing through self.lock, so a UI-thread
+        # redraw waits for a background render() of the same figure. Tk
+        # bound the original methods when the canvas was built, so those
+        # events are bound again to the locked ones.
+        for name in LOCKED_METHODS:
+            method = getattr(canvas, name, None)
+            if method is not None:
+                setattr(canvas, name, self._locked(method))
+        widget = getattr(canvas, "get_tk_widget", None)
+        if widget is not None:
+            widget = widget()
+            for event, name in TK_EVENTS.items():
+                if hasattr(canvas, name):
+                    widget.bind(event, getattr(canvas, name))
+
+    def _locked(self, method):
+        def call(*args, **kwargs):
+            with self.lock:
+                return method(*args, **kwargs)
+        return call
+
+    # ---- one-time setup ----
+    def _build_pie(self, fig):
+        ax = self.ax_pie = fig.add_subplot(111)
+        self.axes.append(ax)
+        self.wedges, self.pie_texts, self.pie_pcts = ax.pie(
+            [1, 1, 1], labels=["", "", ""], autopct="%1.1f%%", startangle=90,
+            labeldistance=PIE_LABEL_DISTANCE, pctdistance=PIE_PCT_DISTANCE)
+        ax.set_title("Portfolio Breakdown")
+
+    def _build_line(self, fig):
+        ax = self.ax_line = fig.add_subplot(111)
+        self.axes.append(ax)
+        self.line_lin, = ax.plot([], [], label="Linear")
+        self.line_comp, = ax.plot([], [], label="Compound", linestyle="--")
+        ax.set_title("Value Over Time")
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    def _build_bar(self, fig):
+        ax = self.ax_bar = fig.add_subplot(111)
+        self.axes.append(ax)
+        self.bars = ax.bar(BAR_LABELS, [0, 0, 0])
+        ax.set_title("Return Comparison")
+        self.bar_texts = [ax.text(i, 0, "", ha="center", va="bottom") for i in range(len(BAR_LABELS))]
+
+    def _build_heatmap(self, fig):
+        ax = self.ax_heatmap = fig.add_subplot(111)
+        self.axes.append(ax)
+        self.heatmap = ax.imshow(np.zeros((2, 2)), origin="lower", aspect="auto", cmap="RdYlGn")
+        self.heatmap_marker, = ax.plot([], [], marker="o", color="k", linestyle="")
+        self.colorbar = fig.colorbar(self.heatmap, ax=ax, label="CAGR (%)")
+        self.axes.append(self.colorbar.ax)
+        ax.set_xlabel("Selling price/share (₹)")
+        ax.set_ylabel("Purchase price/share (₹)")
+        ax.set_title("CAGR by Buy / Sell Price")
+
+    # ---- in-place updates ----
+    def _update_pie(self, r):
+        sizes = _pie_sizes(r)
+        total = sum(sizes)
+        theta = 90.0
+        for wedge, text, pct, label, size in zip(self.wedges, self.pie_texts, self.pie_pcts,
+                                                 _pie_labels(r), sizes):
+            frac = size / total if total else 0.0
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + 360 * frac)
+            mid = math.radians(theta + 180 * frac)
+            x, y = math.cos(mid), math.sin(mid)
+            text.set_position((PIE_LABEL_DISTANCE * x, PIE_LABEL_DISTANCE * y))
+            text.set_horizontalalignment("left" if x > 0 else "right")
+            text.set_text(label)
+            pct.set_position((PIE_PCT_DISTANCE * x, PIE_PCT_DISTANCE * y))
+            pct.set_text(f"{frac * 100:.1f}%")
+            theta += 360 * frac
+
+    def _update_line(self, r):
+        t = np.linspace(0, r["months"], LINE_POINTS)
+        lin, comp = _growth(r, t)
+        self.line_lin.set_data(t, lin)
+        self.line_comp.set_data(t, comp)
+        self.ax_line.relim()
+        self.ax_line.autoscale_view()
+
+    def _update_bar(self, r):
+        for i, (bar, text, v) in enumerate(zip(self.bars, self.bar_texts, _bar_values(r))):
+            bar.set_height(v)
+            text.set_position((i, v))
+            text.set_text(f"{v:.2f}%")
+        self.ax_bar.relim()
+        self.ax_bar.autoscale_view()
+
+    def _update_heatmap(self, r):
+        cagr, extent = _heatmap(r)
+        self.heatmap.set_data(cagr)
+        self.heatmap.set_extent(extent)
+        # Centre the colour scale on 0% so gains and losses read at a glance.
+        lim = np.nanmax(np.abs(cagr)) if np.isfinite(cagr).any() else 1.0
+        self.heatmap.set_clim(-lim, lim)
+        self.heatmap_marker.set_data([r["sp"]], [r["bp"]])
+
+    def _set_visible(self, visible):
+        for ax in self.axes:
+            ax.set_visible(visible)
+
+    def _apply(self, index):
+        if self.result is not None:
+            self._updaters[index](self.result)
+        self._stale[index] = False
+
+    # ---- public API ----
+    def prepare(self, r):
+        """Take result ``r``; every chart is stale until shown or rendered."""
+        with self.lock:
+            self.result = r
+            self._set_visible(r is not None)
+            self._stale = [True] * len(self.canvases)
+
+    def update(self, r, visible=0):
+        """Show result ``r``; redraw tab ``visible`` now, the others when shown."""
+        self.prepare(r)
+        self.show(visible)
+
+    def show(self, index):
+        """Bring chart ``index`` up to date, if stale, and redraw it."""
+        if index is None:
+            return
+        with self.lock:
+            if not self._stale[index]:
+                return
+            self._apply(index)
+        self.canvases[index].draw_idle()
+
+    def render(self, index):
+        """Update chart ``index`` and rasterize it with Agg; safe off the UI
+        thread. Call blit() on the returned canvas from the UI thread."""
+        canvas = self.canvases[index]
+        with self.lock:
+            self._apply(index)
+            # FigureCanvasAgg.draw() minus its GUI hooks (toolbar cursor,
+            # window refresh), which must stay on the UI thread.
+            renderer = canvas.get_renderer()
+            renderer.clear()
+            canvas.figure.draw(renderer)
+        return canvas
+
+    def clear(self, visible=0):
+        self.update(None, visible)
@@ -0,0 +1,129 @@
+"""
+keypad.py
+Client-side calculator keypad for the Streamlit apps
+----------------------------------------------------
+Draws the expression display and the button grid as one Streamlit
+component. Digits, operators, DEL, AC and MR edit the expression in the
+browser, so typing costs no script runs at all; only the keys that need
+the server (``=``, ``M+``, ``M-``, ``MC``, mode) send the typed expression
+and the key to ``Calculator.press``.
+
+Call ``keypad()`` from inside an ``@st.fragment`` so those few server
+round-trips rerun only the fragment, not the whole page.
+"""
+
+import streamlit as st
+
+from calccore.calculator import INERT_KEYS, KEY_INPUTS
+
+# Keys handled by Calculator.press on the server; everything else is
+# applied to the expression in the browser.
+SERVER_KEYS = ("=", "M+", "M-", "MC", "Mode", "MODE", "Deg/Rad")
+
+_HTML = """
+<div class="calc-keypad">
+  <input class="calc-display" type="text" spellcheck="false" autocomplete="off" />
+  <div class="calc-keys"></div>
+</div>
+"""
+
+_CSS = """
+.calc-keypad { display: flex; flex-direction: column; gap: 0.5rem; }
+.calc-display {
+  font: 1.4rem monospace; padding: 0.4rem 0.6rem; text-align: right;
+  border: 1px solid #555; border-radius: 0.4rem; background: #111; color: #00ffaa;
+}
+.calc-keys { display: grid; gap: 0.35rem; }
+.calc-keys button {
+  padding: 0.45rem 0; font-size: 1rem; cursor: pointer;
+  border: 1px solid #555; border-radius: 0.4rem; background: #262730; color: #fafafa;
+}
+.calc-keys button:hover { border-color: #00ffaa; }
+.calc-keys button.server { background: #1f4d3a; }
+"""
+
+_JS = """
+export default function ({ data, setTriggerValue, parentElement }) {
+  const root = parentElement.querySelector(".calc-keypad");
+  const display = root.querySelector(".calc-display");
+  const grid = root.querySelector(".calc-keys");
+
+  // The server only overwrites the display after it has handled a key.
+  if (root.dataset.rev !== String(data.rev)) {
+    display.value = data.expr;
+    root.dataset.rev = String(data.rev);
+  }
+
+  const layout = JSON.stringify(data.rows);
+  if (grid.dataset.layout !== layout) {
+    grid.replaceChildren();
+    grid.style.gridTemplateColumns =
+      `repeat(${Math.max(...data.rows.map((r) => r.length))}, 1fr)`;
+    for (const row of data.rows) {
+      for (const label of row) {
+        const button = document.createElement("button");
+        button.type = "button";
+        button.textContent = label;
+        button.dataset.label = label;
+        if (data.server_keys.includes(label)) button.classList.add("server");
+        grid.appendChild(button);
+      }
+    }
+    grid.dataset.layout = layout;
+  }
+
+  const press = (label) => {
+    if (data.server_keys.includes(label)) {
+      setTriggerValue("press", { label, expr: display.value });
+    } else if (label === "AC" || label === "C") {
+      display.value = "";
+    } else if (label === "DEL") {
+      display.value = display.value.slice(0, -1);
+    } else if (label === "MR") {
+      display.value += data.memory;
+    } else if (!data.inert_keys.includes(label)) {
+      display.value += data.key_inputs[label] ?? label;
+    }
+  };
+
+  grid.onclick = (event) => {
+    const button = event.target.closest("button");
+    if (button) press(button.dataset.label);
+  };
+  display.onkeydown = (event) => {
+    if (event.key === "Enter") press("=");
+  };
+}
+"""
+
+
+def keypad(calc, rows, *, key="keypad", on_press=None):
+    """Mount the keypad for ``calc``; ``on_press(label)`` defaults to ``calc.press``."""
+    rev_key = f"{key}_rev"
+    if rev_key not in st.session_state:
+        st.session_state[rev_key] = 0
+
+    def handle_press():
+        event = st.session_state[key].get("press")
+        if not event:
+            return
+        calc.expr = event.get("expr", calc.expr)
+        (on_press or calc.press)(event["label"])
+        st.session_state[rev_key] += 1
+
+    # Declared on every run, as Streamlit expects: its component registry
+    # belongs to the running server, not to this imported module.
+    component = st.components.v2.component("calc_keypad", html=_HTML, css=_CSS, js=_JS)
+    return component(
+        key=key,
+        data={
+            "rows": rows,
+            "expr": calc.expr,
+            "rev": st.session_state[rev_key],
+            "memory": str(calc.memory.recall()),
+            "key_inputs": KEY_INPUTS,
+            "inert_keys": sorted(INERT_KEYS),
+            "server_keys": list(SERVER_KEYS),
+        },
+        on_press_change=handle_press,
+    )
@@ -0,0 +1,78 @@
+"""
+portfolio_io.py
+Bulk trade import / export for the Investment Return Calculator
+---------------------------------------------------------------
+Reads a CSV or Parquet file of trades in chunks, computes BV, EV, Simple,
+Annualized and CAGR for every row of a chunk in one vectorized pass
+(scenarios.compute) and streams the rows back out with those columns
+added as raw floats. Memory use is bounded by the chunk size, not the file.
+
+Trade files have one row per trade with returns.TRADE_COLUMNS; ``unit`` is
+optional and defaults to months. Rows the calculator would reject get
+empty (NaN) returns.
+
+Needs pandas, plus pyarrow for Parquet.
+"""
+
+import csv
+
+import numpy as np
+
+import scenarios
+from chunked_io import DEFAULT_CHUNKSIZE, FrameWriter, file_format, read_chunks
+from returns import RESULT_COLUMNS, TRADE_COLUMNS, UNIT_COLUMN
+
+# Fixed dtypes, so a blank cell deep in a file can't change a column's type
+# from one chunk to the next.
+TRADE_DTYPES = dict({c: float for c in TRADE_COLUMNS}, **{UNIT_COLUMN: str})
+
+
+def read_trades(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrame chunks of a CSV or Parquet trade file."""
+    return read_chunks(path, chunksize, dtype=TRADE_DTYPES, float_precision="round_trip")
+
+
+def compute_frame(trades):
+    """Copy of ``trades`` with the result columns added."""
+    missing = [c for c in TRADE_COLUMNS if c not in trades.columns]
+    if missing:
+        raise ValueError("Missing columns: " + ", ".join(missing))
+    params = {p: trades[c].to_numpy(dtype=float, na_value=np.nan) for c, p in TRADE_COLUMNS.items()}
+    unit = trades[UNIT_COLUMN].to_numpy() if UNIT_COLUMN in trades.columns else "months"
+    results = scenarios.compute(unit=unit, **params)
+    out = trades.copy()
+    for name in RESULT_COLUMNS:
+        out[name] = np.broadcast_to(results[name], len(out))
+    return out
+
+
+def process_file(src, dst, chunksize=DEFAULT_CHUNKSIZE):
+    """Compute returns for every trade in ``src`` into ``dst``; returns the row count."""
+    with FrameWriter(dst) as writer:
+        for chunk in read_trades(src, chunksize):
+            writer.write(compute_frame(chunk))
+    return writer.rows
+
+
+def trade_row(r, unit="months"):
+    """Trade-file row, results included, for one calculator result ``r``."""
+    row = {c: r[p] for c, p in TRADE_COLUMNS.items() if p != "hp"}
+    row["holding_period"] = r["months"] if unit == "months" else r["years"]
+    row[UNIT_COLUMN] = unit
+    row.update({name: r[name] for name in RESULT_COLUMNS})
+    return row
+
+
+def export_result(r, path, unit="months"):
+    """Save one result as a one-row trade file; CSV needs only the stdlib."""
+    row = trade_row(r, unit)
+    if file_format(path) == "parquet":
+        import pandas as pd
+
+        with FrameWriter(path) as writer:
+            writer.write(pd.DataFrame([row]))
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row))
+            writer.writeheader()
+            writer.writerow(row)
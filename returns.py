@@ -0,0 +1,152 @@
+"""
+returns.py
+Investment return math, headless
+--------------------------------
+The formulas behind the Investment Return Calculator, with no Tk,
+matplotlib or NumPy, so batch jobs and servers can use them directly:
+
+ - Beginning Value  BV = shares × buy price + buy commission
+ - Ending Value     EV = shares × sell price − sell commission + shares × dividend
+ - Simple           (EV − BV) / BV
+ - Annualized       Simple × 12 / months
+ - CAGR             (EV / BV)^(1 / years) − 1
+
+scenarios.py evaluates the same formulas over NumPy arrays.
+
+Command line: reads trade rows as CSV (see TRADE_COLUMNS; ``unit`` is
+optional) from files or stdin and writes them to stdout or ``-o`` with
+the results added:
+
+    python returns.py trades.csv > results.csv
+    cat trades.csv | python returns.py -o results.csv
+"""
+
+import argparse
+import csv
+import sys
+
+# CSV column -> compute() parameter.
+TRADE_COLUMNS = {
+    "shares": "n",
+    "buy_price": "bp",
+    "buy_commission": "bc",
+    "sell_price": "sp",
+    "sell_commission": "sc",
+    "dividend": "dv",
+    "holding_period": "hp",
+}
+UNIT_COLUMN = "unit"
+RESULT_COLUMNS = ("BV", "EV", "simple", "annual", "cagr")
+UNITS = ("months", "years")
+
+
+class InputError(ValueError):
+    """Inputs the calculator can't compute returns for."""
+
+
+def normalize_unit(unit):
+    """Holding period unit as typed -> "months" / "years" (or the unknown
+    name, folded); blank means months."""
+    if not isinstance(unit, str) or not unit.strip():
+        return "months"
+    return unit.strip().casefold()
+
+
+def holding_period(hp, unit="months"):
+    """``(years, months)`` for a holding period in ``unit``."""
+    unit = normalize_unit(unit)
+    if unit not in UNITS:
+        raise InputError(f"Unknown holding period unit {unit!r}.")
+    years = hp / 12 if unit == "months" else hp
+    months = hp if unit == "months" else hp * 12
+    return years, months
+
+
+def beginning_value(n, bp, bc):
+    return n * bp + bc
+
+
+def ending_value(n, sp, sc, dv):
+    return n * sp - sc + n * dv
+
+
+def simple_return(bv, ev):
+    return (ev - bv) / bv
+
+
+def annualized_return(simple, months):
+    return simple / months * 12 if months > 0 else 0
+
+
+def cagr(bv, ev, years):
+    return (ev / bv) ** (1 / years) - 1 if years > 0 and ev > 0 and bv > 0 else 0
+
+
+def compute(n, bp, bc, sp, sc, dv, hp, unit="months"):
+    """All results for one trade, as the dict the GUI charts use."""
+    if n <= 0 or bp < 0 or sp < 0 or hp <= 0:
+        raise InputError("Invalid numeric entries.")
+    years, months = holding_period(hp, unit)
+    BV = beginning_value(n, bp, bc)
+    EV = ending_value(n, sp, sc, dv)
+    if BV <= 0:
+        raise InputError("Beginning value cannot be zero.")
+    simple = simple_return(BV, EV)
+    return dict(
+        BV=BV, EV=EV, n=n, bp=bp, sp=sp, bc=bc, sc=sc, dv=dv,
+        months=months, years=years,
+        simple=simple, annual=annualized_return(simple, months), cagr=cagr(BV, EV, years)
+    )
+
+
+def compute_row(row):
+    """Results for one CSV row (a dict of strings)."""
+    try:
+        params = {p: float(row[c]) for c, p in TRADE_COLUMNS.items()}
+    except KeyError as e:
+        raise InputError(f"Missing column {e.args[0]!r}.") from None
+    except (TypeError, ValueError):
+        raise InputError("Invalid numeric entries.") from None
+    return compute(unit=row.get(UNIT_COLUMN), **params)
+
+
+def process(rows):
+    """Yield each row with the results added; bad rows get an ``error``."""
+    for row in rows:
+        out = dict(row)
+        try:
+            r = compute_row(row)
+        except InputError as e:
+            out.update({name: "" for name in RESULT_COLUMNS}, error=str(e))
+        else:
+            out.update({name: r[name] for name in RESULT_COLUMNS}, error="")
+        yield out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute investment returns for CSV trade rows.")
+    parser.add_argument("files", nargs="*", default=["-"], help="trade CSV files (default: stdin)")
+    parser.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    writer = None
+    try:
+        for name in args.files:
+            f = sys.stdin if name == "-" else open(name, newline="", encoding="utf-8")
+            try:
+                for row in process(csv.DictReader(f)):
+                    if writer is None:
+                        writer = csv.DictWriter(out, fieldnames=list(row), extrasaction="ignore")
+                        writer.writeheader()
+                    writer.writerow(row)
+            finally:
+                if f is not sys.stdin:
+                    f.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+riskcore
+Shared, Streamlit-free core for the Risk-O-Meter app
+----------------------------------------------------
+ - scoring  fund risk map, inflation-adjusted score and its interpretation
+ - batch    the same scores over arrays of funds and scenarios, and files
+ - gauge    the risk gauge, pre-rendered and cached per score
+ - charts   baseline bar and inflation/return line, memoized as PNG
+ - specs    the same three charts as Vega-Lite specs, drawn by the browser
+ - assets   downscaled, cached images for display
+"""
+
+from .assets import NOTES_IMAGE_PATH, notes_thumbnail, thumbnail
+from .charts import CHARTS, ChartCache, bar_png, draw_bar, draw_line, line_png
+from .gauge import GAUGE, GaugeRenderer, draw_gauge, gauge_png
+from .scoring import (
+    FUND_RISK_MAP,
+    INTERPRETATIONS,
+    MAX_SCORE,
+    MIN_SCORE,
+    SCORE_THRESHOLDS,
+    clamp,
+    compute_risk_score,
+    expected_return,
+    interpret_score,
+)
+from .specs import DEFAULT_RENDERER, RENDERERS, bar_spec, gauge_spec, line_spec
+
+# batch is imported on first use, so ``python -m riskcore.batch`` doesn't
+# find it already loaded (runpy warns about that).
+_BATCH_NAMES = ("fund_levels", "interpret_buckets", "score_file", "score_matrix", "write_scores")
+
+
+def __getattr__(name):
+    if name in _BATCH_NAMES:
+        from . import batch
+        return getattr(batch, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,47 @@
+"""
+riskcore/assets.py
+Web-sized image assets
+----------------------
+Phone photos are several megapixels; decoding one and handing it to
+st.image on every rerun re-encodes the full image each time. thumbnail()
+decodes a file once, applies its EXIF rotation, downscales it and encodes
+an optimized progressive JPEG. The bytes are cached by path, mtime and
+size, so replacing the file picks up the new version on the next call.
+Identical bytes keep the same content-addressed Streamlit media URL, so
+browsers reuse their cached copy across reruns.
+
+Set RISKMETER_NOTES_IMAGE to the notes image's path.
+"""
+
+import io
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageOps
+
+NOTES_IMAGE_PATH = os.environ.get(
+    "RISKMETER_NOTES_IMAGE", "/mnt/data/WhatsApp Image 2025-11-23 at 16.57.13_e35090ec.jpg")
+THUMBNAIL_SIZE = (1024, 1024)
+JPEG_QUALITY = 80
+
+
+@lru_cache(maxsize=16)
+def _thumbnail(path, mtime_ns, size, max_size, quality):
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(max_size, Image.LANCZOS)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    return buf.getvalue()
+
+
+def thumbnail(path, max_size=THUMBNAIL_SIZE, quality=JPEG_QUALITY):
+    """JPEG bytes of ``path`` scaled to fit ``max_size``. Raises OSError if unreadable."""
+    st = os.stat(path)
+    return _thumbnail(os.path.abspath(path), st.st_mtime_ns, st.st_size, tuple(max_size), quality)
+
+
+def notes_thumbnail():
+    return thumbnail(NOTES_IMAGE_PATH)
@@ -0,0 +1,107 @@
+"""
+riskcore/charts.py
+Memoized static Risk-O-Meter charts
+-----------------------------------
+The baseline bar chart depends only on the fund risk map and the
+inflation/return line only on the selected fund's base level, so neither
+changes when the inflation slider moves. ChartCache keeps their PNG bytes
+keyed by chart, argument and a version of the map's contents; editing the
+map changes the version, and entries for old versions are dropped.
+"""
+
+import io
+import threading
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from .scoring import FUND_RISK_MAP, expected_return
+
+# Same output as st.pyplot's own savefig defaults.
+SAVEFIG_KWARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def map_version(fund_map):
+    """Hashable version of ``fund_map``'s contents."""
+    return hash(tuple(fund_map.items()))
+
+
+def draw_bar(fund_map=None):
+    fund_map = FUND_RISK_MAP if fund_map is None else fund_map
+    labels = list(fund_map.keys())
+    vals = list(fund_map.values())
+    y = np.arange(len(labels))
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot(111)
+    ax.barh(y, vals)
+    ax.set_yticks(y)
+    ax.set_yticklabels(labels)
+    ax.set_xlabel('Baseline Risk Level (1=Low .. 6=Very High)')
+    fig.tight_layout()
+    return fig
+
+
+def draw_line(selected_fund, fund_map=None):
+    fund_map = FUND_RISK_MAP if fund_map is None else fund_map
+    infl = np.linspace(0, 15, 50)
+    base = fund_map.get(selected_fund, 3)
+    fig = Figure(figsize=(6, 3))
+    ax = fig.add_subplot(111)
+    ax.plot(infl, expected_return(base, infl))
+    ax.set_xlabel('Inflation (%)')
+    ax.set_ylabel('Expected Nominal Return (%)')
+    ax.set_title('Simulated Inflation vs Expected Return')
+    fig.tight_layout()
+    return fig
+
+
+def figure_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, **SAVEFIG_KWARGS)
+    return buf.getvalue()
+
+
+class ChartCache:
+    """PNG bytes of the static charts, invalidated when the fund map changes."""
+
+    def __init__(self, fund_map=None):
+        self.fund_map = FUND_RISK_MAP if fund_map is None else fund_map
+        self._png = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _get(self, key, draw):
+        version = map_version(self.fund_map)
+        data = self._png.get((version, key))
+        if data is None:
+            with self._lock:
+                if version != self._version:
+                    self._png.clear()
+                    self._version = version
+                data = self._png.get((version, key))
+                if data is None:
+                    data = self._png[(version, key)] = figure_png(draw())
+        return data
+
+    def bar_png(self):
+        return self._get(("bar",), lambda: draw_bar(self.fund_map))
+
+    def line_png(self, selected_fund):
+        # The line depends only on the fund's base level, not its name.
+        base = self.fund_map.get(selected_fund, 3)
+        return self._get(("line", base), lambda: draw_line(selected_fund, self.fund_map))
+
+    def clear(self):
+        with self._lock:
+            self._png.clear()
+
+
+CHARTS = ChartCache()
+
+
+def bar_png():
+    return CHARTS.bar_png()
+
+
+def line_png(selected_fund):
+    return CHARTS.line_png(selected_fund)
@@ -0,0 +1,175 @@
+"""
+riskcore/gauge.py
+Pre-rendered Risk-O-Meter gauge
+-------------------------------
+The gauge's bands and labels never change; only the needle moves, and
+compute_risk_score() rounds to two decimals inside [1, 6], so there are at
+most 501 distinct gauges. GaugeRenderer draws the static dial once, blits
+the needle onto a saved copy of it for each score and caches the PNG bytes
+in memory and, optionally, on disk.
+
+Set RISKMETER_CACHE_DIR to a directory to keep rendered gauges across
+restarts.
+"""
+
+import hashlib
+import io
+import os
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from .charts import SAVEFIG_KWARGS
+from .scoring import MAX_SCORE, MIN_SCORE, clamp
+
+BAND_LABELS = ['Low', 'Low-Mod', 'Moderate', 'Mod-High', 'High', 'Very High']
+DEFAULT_CACHE_DIR = os.environ.get("RISKMETER_CACHE_DIR")
+
+# Bump when the drawing below changes, so stale on-disk gauges are ignored.
+_STYLE_VERSION = 1
+
+
+def plt_colormap(i, n):
+    if n <= 1:
+        return (0.5, 0.5, 0.5)
+    r = i / (n - 1)
+    g = 1 - r
+    b = 0.15
+    return (r, g, b)
+
+
+def needle_angle(score):
+    return np.pi - ((score - MIN_SCORE) / (MAX_SCORE - MIN_SCORE)) * np.pi
+
+
+def _draw_dial(ax):
+    bands = len(BAND_LABELS)
+    for i in range(bands):
+        start = np.pi - (i / bands) * np.pi
+        end = np.pi - ((i + 1) / bands) * np.pi
+        ax.bar(end, 1.0, width=start - end, bottom=0.0, align='edge',
+               color=plt_colormap(i, bands), edgecolor='k', linewidth=0.5)
+
+    for i, lab in enumerate(BAND_LABELS):
+        ang = np.pi - ((i + 0.5) / bands) * np.pi
+        deg = (ang - np.pi/2) * (180/np.pi)
+        ax.text(ang, 1.05, lab, rotation=-deg, ha='center', va='center')
+
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_ylim(0, 1.2)
+    ax.set_theta_zero_location('N')
+    ax.set_theta_direction(-1)
+
+
+def _draw_needle(ax, score, animated=False):
+    angle = needle_angle(score)
+    needle, = ax.plot([angle, angle], [0, 0.9], linewidth=3, color='k', animated=animated)
+    hub = ax.scatter([0.0], [0.0], s=60, color='k', zorder=5, animated=animated)
+    return needle, hub
+
+
+def draw_gauge(score):
+    """The gauge as a standalone matplotlib Figure."""
+    fig = Figure(figsize=(5, 3))
+    ax = fig.add_subplot(111, polar=True)
+    _draw_dial(ax)
+    _draw_needle(ax, score)
+    fig.tight_layout()
+    return fig
+
+
+class GaugeRenderer:
+    """Thread-safe PNG renderer for the gauge, cached per rounded score."""
+
+    # Same resolution as st.pyplot's output (and the other charts).
+    def __init__(self, figsize=(5, 3), dpi=SAVEFIG_KWARGS["dpi"], cache_dir=DEFAULT_CACHE_DIR):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.cache_dir = cache_dir
+        self._png = {}
+        self._lock = threading.Lock()
+        self._canvas = None
+        tag = repr((_STYLE_VERSION, tuple(figsize), dpi, BAND_LABELS)).encode()
+        self._tag = hashlib.sha1(tag).hexdigest()[:10]
+
+    def _setup(self):
+        fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111, polar=True)
+        _draw_dial(ax)
+        # Animated artists are left out of canvas.draw(), so the saved
+        # background is the bare dial.
+        self._needle, self._hub = _draw_needle(ax, MIN_SCORE, animated=True)
+        fig.tight_layout()
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(fig.bbox)
+        self._ax = ax
+        self._canvas = canvas
+
+    def _render(self, score):
+        if self._canvas is None:
+            self._setup()
+        canvas = self._canvas
+        canvas.restore_region(self._background)
+        angle = needle_angle(score)
+        self._needle.set_xdata([angle, angle])
+        self._ax.draw_artist(self._needle)
+        self._ax.draw_artist(self._hub)
+        w, h = canvas.get_width_height()
+        buf = io.BytesIO()
+        Image.frombuffer("RGBA", (w, h), canvas.buffer_rgba(), "raw", "RGBA", 0, 1).save(buf, "PNG")
+        return buf.getvalue()
+
+    def _disk_path(self, score):
+        return os.path.join(self.cache_dir, f"gauge-{self._tag}-{score:.2f}.png")
+
+    def _render_cached(self, score):
+        if not self.cache_dir:
+            return self._render(score)
+        path = self._disk_path(score)
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            pass
+        data = self._render(score)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return data
+
+    def png(self, score):
+        """PNG bytes of the gauge with its needle at ``score``."""
+        score = round(clamp(float(score), MIN_SCORE, MAX_SCORE), 2)
+        data = self._png.get(score)
+        if data is None:
+            with self._lock:
+                data = self._png.get(score)
+                if data is None:
+                    data = self._png[score] = self._render_cached(score)
+        return data
+
+    def warm(self):
+        """Render every reachable score, e.g. at startup."""
+        for i in range(int((MAX_SCORE - MIN_SCORE) * 100) + 1):
+            self.png(MIN_SCORE + i / 100)
+
+    def clear(self):
+        with self._lock:
+            self._png.clear()
+
+
+GAUGE = GaugeRenderer()
+
+
+def gauge_png(score):
+    return GAUGE.png(score)
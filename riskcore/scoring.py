@@ -0,0 +1,52 @@
+"""
+riskcore/scoring.py
+Fund risk scores under inflation
+"""
+
+FUND_RISK_MAP = {
+    'Fixed Maturity / Income Funds': 1,
+    'Short-Term Debt Funds': 2,
+    'Hybrid Funds (Balanced)': 3,
+    'Large Cap / Balanced Equity': 4,
+    'Small Cap / Sectoral Funds': 5,
+    'Speculative (Derivatives/Crypto)': 6,
+}
+
+MIN_SCORE = 1.0
+MAX_SCORE = 6.0
+
+# interpret_score() returns INTERPRETATIONS[i] for the first upper bound
+# SCORE_THRESHOLDS[i] the score doesn't exceed, else the last entry.
+SCORE_THRESHOLDS = (1.5, 2.5, 3.5, 4.5, 5.5)
+INTERPRETATIONS = (
+    'Very Low Risk: suitable for capital preservation, income funds, fixed maturity products.',
+    'Low Risk: short-term debt, conservative hybrid funds.',
+    'Moderate Risk: balanced funds, moderate equity exposure; good for medium term.',
+    'Moderate to High Risk: large-cap equity, balanced equity funds; expect volatility.',
+    'High Risk: small-cap & sectoral funds, higher volatility and higher potential returns.',
+    'Very High Risk: speculative investments like derivatives and crypto. High potential returns and high losses.',
+)
+
+
+def clamp(x, a, b):
+    return max(a, min(b, x))
+
+
+def compute_risk_score(base, inflation, max_infl=15.0, shift_magnitude=1.8):
+    shift = (inflation / max_infl) * shift_magnitude
+    new_score = base - shift
+    return round(clamp(new_score, MIN_SCORE, MAX_SCORE), 2)
+
+
+def expected_return(base, inflation):
+    """Simulated nominal return (%) of a fund with risk level ``base``."""
+    baseline_return = 6 + (base - 3) * 3
+    return baseline_return - (inflation * 0.6)
+
+
+def interpret_score(score):
+    s = float(score)
+    for limit, text in zip(SCORE_THRESHOLDS, INTERPRETATIONS):
+        if s <= limit:
+            return text
+    return INTERPRETATIONS[-1]
@@ -0,0 +1,126 @@
+"""
+riskcore/specs.py
+Browser-rendered Risk-O-Meter charts
+------------------------------------
+Vega-Lite specs for the gauge, the baseline bar chart and the
+inflation/return line. The browser draws them, so the server does no
+rendering and each rerun ships a few hundred bytes of JSON instead of
+PNGs. The specs mirror the matplotlib charts in gauge.py and charts.py.
+
+Set RISKMETER_RENDERER=vega to make the app use these instead of PNGs.
+"""
+
+import math
+import os
+
+from matplotlib.colors import to_hex
+
+from .gauge import BAND_LABELS, needle_angle, plt_colormap
+from .scoring import FUND_RISK_MAP, expected_return
+
+RENDERERS = ("png", "vega")
+DEFAULT_RENDERER = os.environ.get("RISKMETER_RENDERER", "png")
+
+_RADIUS = 110
+_NEEDLE_HALF_WIDTH = 0.02  # radians
+
+
+def _gauge_bands():
+    n = len(BAND_LABELS)
+    bands = []
+    for i, lab in enumerate(BAND_LABELS):
+        mid = math.pi - ((i + 0.5) / n) * math.pi
+        bands.append({
+            "band": lab,
+            "start": round(math.pi - (i / n) * math.pi, 4),
+            "end": round(math.pi - ((i + 1) / n) * math.pi, 4),
+            "mid": round(mid, 4),
+            "rot": round(math.degrees(mid) - 90, 1),
+            "color": to_hex(plt_colormap(i, n)),
+        })
+    return bands
+
+
+# Vega-Lite measures theta clockwise from 12 o'clock, the same orientation
+# the matplotlib gauge uses, so the angles carry over unchanged.
+_GAUGE_LAYERS = [
+    {
+        "data": {"values": _gauge_bands()},
+        "layer": [
+            {
+                "mark": {"type": "arc", "outerRadius": _RADIUS, "stroke": "black", "strokeWidth": 0.5},
+                "encoding": {
+                    "theta": {"field": "end", "type": "quantitative", "scale": None},
+                    "theta2": {"field": "start"},
+                    "color": {"field": "color", "type": "nominal", "scale": None},
+                },
+            },
+            {
+                "mark": {"type": "text", "radius": _RADIUS * 1.05},
+                "encoding": {
+                    "theta": {"field": "mid", "type": "quantitative", "scale": None},
+                    "angle": {"field": "rot", "type": "quantitative", "scale": None},
+                    "text": {"field": "band"},
+                },
+            },
+        ],
+    },
+]
+
+
+def gauge_spec(score):
+    angle = float(needle_angle(score))
+    needle = {
+        "data": {"values": [{"a": angle - _NEEDLE_HALF_WIDTH, "b": angle + _NEEDLE_HALF_WIDTH}]},
+        "layer": [
+            {
+                "mark": {"type": "arc", "outerRadius": _RADIUS * 0.9, "color": "black"},
+                "encoding": {
+                    "theta": {"field": "a", "type": "quantitative", "scale": None},
+                    "theta2": {"field": "b"},
+                },
+            },
+            {
+                "mark": {"type": "arc", "outerRadius": 5, "color": "black"},
+                "encoding": {
+                    "theta": {"datum": 0, "type": "quantitative", "scale": None},
+                    "theta2": {"datum": 2 * math.pi},
+                },
+            },
+        ],
+    }
+    return {
+        "width": 2 * _RADIUS + 80,
+        "height": 2 * _RADIUS + 40,
+        "layer": _GAUGE_LAYERS + [needle],
+        "config": {"view": {"stroke": None}},
+    }
+
+
+def bar_spec(fund_map=None):
+    fund_map = FUND_RISK_MAP if fund_map is None else fund_map
+    return {
+        "data": {"values": [{"fund": k, "level": v} for k, v in fund_map.items()]},
+        "mark": "bar",
+        "encoding": {
+            "y": {"field": "fund", "type": "nominal", "sort": None, "title": None},
+            "x": {"field": "level", "type": "quantitative",
+                  "title": "Baseline Risk Level (1=Low .. 6=Very High)"},
+        },
+    }
+
+
+def line_spec(selected_fund, fund_map=None):
+    fund_map = FUND_RISK_MAP if fund_map is None else fund_map
+    base = fund_map.get(selected_fund, 3)
+    # The simulated return is linear in inflation, so two points suffice.
+    points = [{"inflation": x, "return": expected_return(base, x)} for x in (0, 15)]
+    return {
+        "title": "Simulated Inflation vs Expected Return",
+        "data": {"values": points},
+        "mark": "line",
+        "encoding": {
+            "x": {"field": "inflation", "type": "quantitative", "title": "Inflation (%)"},
+            "y": {"field": "return", "type": "quantitative", "title": "Expected Nominal Return (%)"},
+        },
+    }
@@ -0,0 +1,93 @@
+"""
+scenarios.py
+What-if scenario sweeps for the Investment Return Calculator
+------------------------------------------------------------
+The same BV / EV / Simple / Annualized / CAGR formulas as the calculator,
+evaluated with NumPy over whole arrays of inputs at once:
+
+ - compute()      any mix of scalars and arrays, broadcast together
+ - grid()         every combination of one or more swept parameters
+ - monte_carlo()  uniform random samples of parameter ranges
+ - summarize()    percentiles of each metric over a sweep
+
+Parameters are n (shares), bp / sp (buy / sell price per share), bc / sc
+(buy / sell commission), dv (dividend per share) and hp (holding period,
+in months or years, read as returns.normalize_unit does). Scenarios the
+calculator would reject (no shares, negative prices, non-positive BV or
+holding period, unknown unit) give NaN returns.
+
+    >>> r = grid(dict(n=150, bp=25, bc=20, sc=20, dv=1, hp=15),
+    ...          bp=np.linspace(20, 30, 11), sp=np.linspace(20, 40, 21))
+    >>> r["cagr"].shape
+    (11, 21)
+"""
+
+import numpy as np
+
+from returns import normalize_unit
+
+PARAMS = ("n", "bp", "bc", "sp", "sc", "dv", "hp")
+METRICS = ("BV", "EV", "simple", "annual", "cagr")
+
+_normalize_units = np.frompyfunc(normalize_unit, 1, 1)
+
+
+def compute(n, bp, bc, sp, sc, dv, hp, unit="months"):
+    """Dict of metric arrays for the broadcast inputs; ``unit`` may be an array too."""
+    n, bp, bc, sp, sc, dv, hp = (np.asarray(x, dtype=float) for x in (n, bp, bc, sp, sc, dv, hp))
+    unit = _normalize_units(np.asarray(unit, dtype=object))
+    in_years = unit == "years"
+    known = in_years | (unit == "months")
+    years = np.where(in_years, hp, hp / 12)
+    months = np.where(in_years, hp * 12, hp)
+    BV = n * bp + bc
+    EV = n * sp - sc + n * dv
+
+    valid = (n > 0) & (bp >= 0) & (sp >= 0) & (hp > 0) & (BV > 0) & known
+    with np.errstate(all="ignore"):
+        simple = (EV - BV) / BV
+        annual = np.where(months > 0, simple / months * 12, 0.0)
+        cagr = np.where((years > 0) & (EV > 0) & (BV > 0), (EV / BV) ** (1 / years) - 1, 0.0)
+    return {
+        "BV": BV,
+        "EV": EV,
+        "simple": np.where(valid, simple, np.nan),
+        "annual": np.where(valid, annual, np.nan),
+        "cagr": np.where(valid, cagr, np.nan),
+    }
+
+
+def grid(base, unit="months", **axes):
+    """Sweep every combination of ``axes`` (name -> values) around ``base``.
+
+    Result arrays have one dimension per axis, in keyword order.
+    """
+    unknown = set(base) - set(PARAMS) | set(axes) - set(PARAMS)
+    if unknown:
+        raise ValueError("Unknown parameters: " + ", ".join(sorted(unknown)))
+    mesh = np.meshgrid(*(np.asarray(v, dtype=float) for v in axes.values()), indexing="ij")
+    params = dict(base)
+    params.update(zip(axes, mesh))
+    return compute(unit=unit, **params)
+
+
+def monte_carlo(base, ranges, size=10_000, unit="months", seed=None):
+    """Sample each ``ranges`` parameter uniformly from its ``(low, high)``.
+
+    Returns ``(samples, results)``, both dicts of length-``size`` arrays.
+    """
+    rng = np.random.default_rng(seed)
+    samples = {name: rng.uniform(lo, hi, size) for name, (lo, hi) in ranges.items()}
+    params = dict(base)
+    params.update(samples)
+    return samples, compute(unit=unit, **params)
+
+
+def summarize(results, percentiles=(5, 25, 50, 75, 95)):
+    """``{metric: {percentile: value}}``, ignoring invalid scenarios."""
+    out = {}
+    for metric, values in results.items():
+        values = np.ravel(values)
+        values = values[~np.isnan(values)]
+        out[metric] = dict(zip(percentiles, np.percentile(values, percentiles))) if values.size else {}
+    return out
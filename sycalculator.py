@@ -1,23 +1,13 @@
 import streamlit as st
-import math
-import operator
+
+from calccore import Calculator, format_result
+from calccore.backends import BACKEND_CHOICES
 
 # --- Helper: Safe evaluation environment ---
-SAFE_DICT = {k: getattr(math, k) for k in dir(math) if not k.startswith("__")}
-# Add commonly used names
-SAFE_DICT.update({
-    'pi': math.pi,
-    'e': math.e,
-    'sqrt': math.sqrt,
-    'ln': math.log,
-    'log': lambda x, base=10: math.log(x, base),
-    'fact': math.factorial,
-    'factorial': math.factorial,
-    'abs': abs,
-    'pow': pow,
-})
-
-# basic operators allowed via eval string (Python operators are used)
+# Expressions go through the shared, Streamlit-free calccore package: math
+# functions plus pi, e, sqrt, ln, log, fact, abs, pow and degree-aware trig,
+# with results cached process-wide and costly operations bounded. Extra
+# functions go through calccore.register_function().
 
 # --- App UI and logic ---
 st.set_page_config(page_title="Casio-like Scientific Calculator", layout="wide")
@@ -27,92 +17,55 @@ st.markdown("A Streamlit app that mimics a Casio fx‑991 style scientific calcu
             )
 
 # initialize session state
-if 'expr' not in st.session_state:
-    st.session_state.expr = ''
-if 'ans' not in st.session_state:
-    st.session_state.ans = ''
-if 'mode' not in st.session_state:
-    st.session_state.mode = 'DEG'  # or 'RAD'
-if 'history' not in st.session_state:
-    st.session_state.history = []
+if 'calc' not in st.session_state:
+    st.session_state.calc = Calculator()
+if 'result' not in st.session_state:
+    st.session_state.result = ''
+if 'backend' not in st.session_state:
+    st.session_state.backend = 'FLOAT'  # or 'DECIMAL(34)', 'FRACTION'
+calc = st.session_state.calc
+
+
+def on_key(label):
+    # runs as a button callback, before the script redraws the display
+    if label == '=':
+        try:
+            # format large floats
+            st.session_state.result = format_result(calc.evaluate())
+        except Exception as e:
+            st.session_state.result = f"Error: {e}"
+    elif label == 'Clear':
+        calc.press('C')
+        st.session_state.result = ''
+    else:
+        calc.press(label)
+
+
+def set_backend():
+    calc.backend = st.session_state.backend
 
 # Display panel
 with st.container():
-    st.subheader(f"Mode: {st.session_state.mode}")
+    st.subheader(f"Mode: {calc.mode}")
     display_col, keypad_col = st.columns([2, 5])
 
     with display_col:
-        st.text_area("Expression", value=st.session_state.expr, height=60, key='display_expr', disabled=True)
+        st.text_area("Expression", value=calc.expr, height=60, disabled=True)
         st.markdown("**Result:**")
-        st.write(st.session_state.ans)
+        st.write(st.session_state.result)
 
         # History
         if st.button("Clear History"):
-            st.session_state.history = []
-        if st.session_state.history:
+            calc.history.clear()
+        if calc.history:
             st.markdown("**History (last 10)**")
-            for item in st.session_state.history[-10:][::-1]:
-                st.write(item)
+            for expr, res in calc.history.recent(10):
+                st.write(f"{expr} = {res}")
 
     with keypad_col:
         # layout rows of buttons mimicking a scientific calculator
-        def btn(label, key=None, append=True):
-            if st.button(label, key=key or label):
-                if label == 'C':
-                    st.session_state.expr = ''
-                elif label == 'DEL':
-                    st.session_state.expr = st.session_state.expr[:-1]
-                elif label == 'Ans':
-                    st.session_state.expr += str(st.session_state.ans)
-                elif label == 'Mode':
-                    st.session_state.mode = 'RAD' if st.session_state.mode == 'DEG' else 'DEG'
-                elif label == '=':
-                    # evaluate
-                    expr = st.session_state.expr.replace('^', '**')
-                    try:
-                        # handle degree/radian conversions for trig if needed
-                        safe_locals = SAFE_DICT.copy()
-                        if st.session_state.mode == 'DEG':
-                            # wrap sin/cos/tan to convert degrees -> radians
-                            safe_locals.update({
-                                'sin': lambda x: math.sin(math.radians(x)),
-                                'cos': lambda x: math.cos(math.radians(x)),
-                                'tan': lambda x: math.tan(math.radians(x)),
-                                'asin': lambda x: math.degrees(math.asin(x)),
-                                'acos': lambda x: math.degrees(math.acos(x)),
-                                'atan': lambda x: math.degrees(math.atan(x)),
-                            })
-                        else:
-                            safe_locals.update({
-                                'sin': math.sin,
-                                'cos': math.cos,
-                                'tan': math.tan,
-                                'asin': math.asin,
-                                'acos': math.acos,
-                                'atan': math.atan,
-                            })
-
-                        # allow usage of percent symbol as /100
-                        expr = expr.replace('%', '/100')
-
-                        result = eval(expr, {"__builtins__": None}, safe_locals)
-                        # format large floats
-                        if isinstance(result, float):
-                            if result.is_integer():
-                                result = int(result)
-                            else:
-                                result = round(result, 12)
-                        st.session_state.ans = result
-                        st.session_state.history.append(f"{st.session_state.expr} = {result}")
-                    except Exception as e:
-                        st.session_state.ans = f"Error: {e}"
-                else:
-                    # append the label text (for e.g. 'sin(', '(', etc.)
-                    if append:
-                        st.session_state.expr += label
-                    else:
-                        # special behaviors
-                        pass
+        def btn(label, key=None):
+            st.button(label, key=key or label, on_click=on_key, args=(label,))
 
         # Row 1
         r1 = st.columns([1,1,1,1,1,1])
@@ -179,17 +132,16 @@ with st.container():
 
         # Extra small controls
         st.markdown("---")
-        colA, colB, colC = st.columns(3)
+        colA, colB, colC, colD = st.columns(4)
         with colA:
-            if st.button('Deg/Rad'):
-                st.session_state.mode = 'RAD' if st.session_state.mode == 'DEG' else 'DEG'
+            st.button('Deg/Rad', on_click=calc.toggle_mode)
+        with colD:
+            st.selectbox('Number mode', BACKEND_CHOICES, key='backend', on_change=set_backend)
         with colB:
             if st.button('Copy Result'):
                 st.write('Result copied to clipboard — use your browser copy.')
         with colC:
-            if st.button('Clear'):
-                st.session_state.expr = ''
-                st.session_state.ans = ''
+            st.button('Clear', on_click=on_key, args=('Clear',))
 
 st.markdown('---')
 st.markdown("""**Notes:**
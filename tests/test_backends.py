@@ -0,0 +1,47 @@
+from decimal import Decimal
+from fractions import Fraction
+
+from calccore import Calculator
+from calccore.backends import get_backend
+
+
+def test_decimal_accepts_fraction_ans():
+    assert get_backend("DECIMAL(20)").evaluate("Ans×3", ans=Fraction(1, 3)) == 1
+    assert get_backend("DECIMAL(20)").evaluate("2+2", ans=Fraction(1, 3)) == 4
+
+
+def test_switching_backends_keeps_ans_usable():
+    calc = Calculator(backend="FRACTION")
+    calc.expr = "1/3"
+    calc.press("=")
+    assert calc.ans == Fraction(1, 3)
+
+    calc.backend = "DECIMAL(34)"
+    calc.expr = "2+2"
+    calc.press("=")
+    assert calc.error is None
+    assert calc.ans == 4
+
+    calc.backend = "FRACTION"
+    calc.expr = "Ans/8"
+    calc.press("=")
+    assert calc.error is None
+    assert calc.ans == Fraction(1, 2)
+    assert isinstance(get_backend("DECIMAL(34)").evaluate("Ans", ans=calc.ans), Decimal)
+
+
+def test_registered_functions_reach_exact_backends():
+    from calccore import register_function
+    from calccore.sandbox import safe_evaluate
+
+    # Build the DECIMAL and FRACTION namespaces before registering.
+    assert safe_evaluate("1+1", backend="DECIMAL(20)") == 2
+    assert safe_evaluate("1+1", backend="FRACTION") == 2
+
+    register_function("triple_exact", lambda x: 3 * x)
+    assert safe_evaluate("triple_exact(1/3)", backend="FRACTION") == 1
+    assert safe_evaluate("triple_exact(0.1)", backend="DECIMAL(20)") == Decimal("0.3")
+    assert get_backend("FRACTION").evaluate("triple_exact(2)") == 6
+
+    register_function("triple_exact", lambda x: 30 * x)
+    assert safe_evaluate("triple_exact(2)", backend="FRACTION") == 60
@@ -0,0 +1,14 @@
+from calccore import Calculator, register_function
+
+
+def test_reregistering_a_function_retires_cached_results():
+    calc = Calculator()
+    register_function("scaled_cache", lambda x: x + 1)
+    calc.expr = "scaled_cache(2)"
+    calc.press("=")
+    assert calc.ans == 3
+
+    register_function("scaled_cache", lambda x: x * 100)
+    calc.expr = "scaled_cache(2)"
+    calc.press("=")
+    assert calc.ans == 200
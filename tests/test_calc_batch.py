@@ -0,0 +1,27 @@
+import math
+
+import numpy as np
+import pytest
+
+from calccore.batch import evaluate_batch
+
+
+def test_large_ncr_does_not_size_a_table_by_its_argument():
+    x = np.array([5.0, 300.0, 1e6, 1e7, 1e9])
+    out = evaluate_batch("nCr(x,2)", x=x)
+    assert out.tolist() == [float(math.comb(int(v), 2)) for v in x]
+
+
+@pytest.mark.parametrize("func, ref", [("nCr", math.comb), ("nPr", math.perm)])
+def test_representable_results_are_exact(func, ref):
+    n, r = np.meshgrid(np.r_[0:200, 1000, 12345, 10**6, 10**7], np.r_[0:40, 60, 100, 190])
+    n, r = n.ravel(), r.ravel()
+    out = evaluate_batch(f"{func}(n,r)", n=n.astype(float), r=r.astype(float))
+    for a, b, got in zip(n, r, out):
+        want = ref(int(a), int(b))
+        if want < 2**53:
+            assert got == want, (func, a, b)
+        elif want < 2**1024:
+            assert got == pytest.approx(float(want), rel=1e-12), (func, a, b)
+        else:
+            assert np.isinf(got), (func, a, b)
@@ -0,0 +1,16 @@
+from calccore import Calculator
+
+
+def test_undisplayable_result_leaves_ans_and_history_alone():
+    calc = Calculator()
+    calc.expr = "6×7"
+    calc.press("=")
+    assert calc.ans == 42
+
+    # Each power is small enough to pass the sandbox; the product isn't printable.
+    calc.expr = "2^10000×2^10000"
+    calc.press("=")
+    assert "too large to display" in calc.error
+    assert calc.ans == 42
+    assert [expr for expr, _ in calc.history] == ["6×7"]
+    assert all(str(res) for _, res in calc.history)
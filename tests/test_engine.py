@@ -0,0 +1,78 @@
+import math
+
+import pytest
+
+from calccore.engine import ExpressionError, evaluate, normalize
+
+
+@pytest.mark.parametrize("expr, expected", [
+    # ln / log are distinct functions (the replace chain made math.math.log10)
+    ("ln(e)", 1.0),
+    ("log(100)", 2.0),
+    ("ln(e^2)+log(1000)", 5.0),
+    ("log(8,2)", 3.0),
+    # exponent literals are numbers, not e the constant
+    ("1e5", 1e5),
+    ("2.5e-3", 0.0025),
+    ("1e5+e", 1e5 + math.e),
+    ("e×2", 2 * math.e),
+    # implicit multiplication
+    ("2π", 2 * math.pi),
+    ("2(3+4)", 14),
+    ("(1+2)(3+4)", 21),
+    ("3√(16)", 12.0),
+    ("2sin(30)", pytest.approx(1.0)),
+    ("2 3", 6),
+    # percent and factorial are postfix
+    ("50%", 0.5),
+    ("200×10%", 20.0),
+    ("5!", 120),
+    ("3!+1", 7),
+    ("2^3!", 64),
+    ("3!²", 36),
+    # powers: right-associative, unary minus below ^
+    ("2^3^2", 512),
+    ("-2^2", -4),
+    ("2^-1", 0.5),
+    ("2**10", 1024),
+    # nCr / nPr bind tighter than × and ÷, looser than ^ and !
+    ("5nCr2", 10),
+    ("5nPr2", 20),
+    ("2×5nCr2", 20),
+    ("5nCr2×2", 20),
+    ("10nCr3+1", 121),
+    ("2^2nCr2", 6),
+    ("nCr(5,2)+nPr(5,2)", 30),
+    # symbols, roots, brackets
+    ("6×7", 42),
+    ("7÷2", 3.5),
+    ("8−3", 5),
+    ("√16", 4.0),
+    ("√(2)^2", pytest.approx(2.0)),
+    ("2×(3+4", 14),
+    ("math.sqrt(4)", 2.0),
+])
+def test_evaluate(expr, expected):
+    assert evaluate(expr) == expected
+
+
+@pytest.mark.parametrize("expr, mode, ans, expected", [
+    ("sin(90)", "DEG", 0, 1.0),
+    ("sin(π÷2)", "RAD", 0, 1.0),
+    ("acos(0)", "DEG", 0, 90.0),
+    ("Ans×2", "DEG", 21, 42),
+    ("Ans!", "DEG", 4, 24),
+])
+def test_evaluate_with_mode_and_ans(expr, mode, ans, expected):
+    assert evaluate(expr, mode, ans) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("expr", ["", "2+", "2)", "(", "_x", "2$", "sin(", "5nCr"])
+def test_invalid_expressions(expr):
+    with pytest.raises(ExpressionError):
+        evaluate(expr)
+
+
+@pytest.mark.parametrize("text", ["2 × 3", "2*3", "2·3", " 2 *3 "])
+def test_normalize(text):
+    assert normalize(text) == "2*3"
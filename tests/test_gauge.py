@@ -0,0 +1,15 @@
+import io
+
+import pytest
+
+pytest.importorskip("matplotlib")
+from PIL import Image
+
+from riskcore.charts import SAVEFIG_KWARGS
+from riskcore.gauge import GaugeRenderer
+
+
+def test_gauge_renders_at_the_chart_resolution():
+    png = GaugeRenderer(cache_dir=None).png(3.5)
+    w, h = Image.open(io.BytesIO(png)).size
+    assert (w, h) == (5 * SAVEFIG_KWARGS["dpi"], 3 * SAVEFIG_KWARGS["dpi"])
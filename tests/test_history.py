@@ -0,0 +1,32 @@
+import gc
+
+from calccore import History
+
+
+def test_spill_connection_is_lazy_and_released(tmp_path):
+    path = str(tmp_path / "history.db")
+    with History(capacity=2, spill_path=path) as h:
+        h.add("1+1", 2)
+        h.add("2+2", 4)
+        assert h._db is None  # nothing spilled yet, no handle
+
+        h.add("3+3", 6)
+        assert h._db is not None
+        assert h.search("1+") == [("1+1", 2)]
+    assert h._db is None
+
+    # Still usable after close(): a search reopens the file.
+    assert h.search("1+") == [("1+1", 2)]
+    release = h._release
+    del h
+    gc.collect()
+    assert not release.alive
+
+
+def test_named_session_finds_earlier_spills(tmp_path):
+    path = str(tmp_path / "history.db")
+    with History(capacity=1, spill_path=path, session="s") as h:
+        h.add("1+1", 2)
+        h.add("2+2", 4)
+    with History(capacity=1, spill_path=path, session="s") as h:
+        assert h.search("1+") == [("1+1", 2)]
@@ -0,0 +1,45 @@
+import threading
+
+from weathercore.icons import IconCache
+
+
+class SlowSession:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def get(self, url, timeout=None):
+        self.calls.append(url)
+        self.started.set()
+        self.release.wait(5)
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    content = b"png"
+
+
+def test_download_does_not_block_cached_icons_and_is_shared(tmp_path):
+    session = SlowSession()
+    icons = IconCache(directory=str(tmp_path), url="https://icons/{code}", session=session)
+    (tmp_path / "02d@2x.png").write_bytes(b"cached")
+
+    results = []
+    fetchers = [threading.Thread(target=lambda: results.append(icons.png("01d"))) for _ in range(3)]
+    for t in fetchers:
+        t.start()
+    assert session.started.wait(5)
+
+    cached = []
+    lookup = threading.Thread(target=lambda: cached.append(icons.png("02d")))
+    lookup.start()
+    lookup.join(1)
+    assert cached == [b"cached"]  # answered while 01d is still downloading
+
+    session.release.set()
+    for t in fetchers:
+        t.join(5)
+    assert results == [b"png"] * 3
+    assert session.calls == ["https://icons/01d"]
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+pytest.importorskip("matplotlib")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from investment_charts import ReturnCharts
+
+
+def test_canvas_draw_waits_for_a_background_render():
+    charts = ReturnCharts(*(FigureCanvasAgg(Figure()) for _ in range(3)))
+    drawn = threading.Event()
+    with charts.lock:
+        t = threading.Thread(target=lambda: (charts.canvases[0].draw(), drawn.set()))
+        t.start()
+        assert not drawn.wait(0.2)
+    t.join(5)
+    assert drawn.is_set()
+
+
+class _TkWidget:
+    def __init__(self):
+        self.bindings = {}
+
+    def bind(self, event, func):
+        self.bindings[event] = func
+
+
+class _TkCanvas(FigureCanvasAgg):
+    # Agg canvas with the Tk hooks ReturnCharts rebinds.
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.widget = _TkWidget()
+        self.resized = 0
+
+    def get_tk_widget(self):
+        return self.widget
+
+    def resize(self, event):
+        self.resized += 1
+
+
+def test_tk_resize_events_wait_for_a_background_render():
+    charts = ReturnCharts(*(_TkCanvas(Figure()) for _ in range(3)))
+    canvas = charts.canvases[0]
+    on_configure = canvas.widget.bindings["<Configure>"]
+    with charts.lock:
+        t = threading.Thread(target=on_configure, args=(None,))
+        t.start()
+        t.join(0.2)
+        assert canvas.resized == 0
+    t.join(5)
+    assert canvas.resized == 1
@@ -0,0 +1,37 @@
+import math
+
+import pandas as pd
+import pytest
+
+import portfolio_io
+
+pytest.importorskip("pyarrow")
+
+HEADER = "shares,buy_price,buy_commission,sell_price,sell_commission,dividend,holding_period,unit,note\n"
+# With chunksize=3 every column changes its inferred type between chunks:
+# ints gain blanks or fractions, and "note" is blank, then text, then blank.
+ROWS = [
+    "10,100,5,120,5,1,12,months,",
+    "20,50,5,60,5,0,24,months,",
+    "30,10,1,12,1,0,2,years,",
+    "40,10,,12,1,0,2,years,late text",
+    ",10,1,12,1,0,2,,",
+    "50,10,1,12,1,0.5,2,years,",
+    "60,10,1,12,1,0,2,,",
+]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_mixed_null_columns_across_chunks(tmp_path, suffix):
+    src = tmp_path / "trades.csv"
+    src.write_text(HEADER + "\n".join(ROWS) + "\n")
+    dst = tmp_path / f"results{suffix}"
+
+    assert portfolio_io.process_file(src, dst, chunksize=3) == len(ROWS)
+
+    out = pd.read_parquet(dst) if suffix == ".parquet" else pd.read_csv(dst)
+    assert len(out) == len(ROWS)
+    assert out["dividend"].tolist() == [1, 0, 0, 0, 0, 0.5, 0]
+    assert out["note"].iloc[3] == "late text"
+    assert math.isnan(out["cagr"].iloc[4])
+    assert out["cagr"].iloc[0] == pytest.approx(0.19900497512437812)
@@ -0,0 +1,56 @@
+import csv
+import io
+import math
+
+import numpy as np
+import pytest
+
+import returns
+import scenarios
+
+TRADE = dict(shares="150", buy_price="25", buy_commission="20", sell_price="35",
+             sell_commission="20", dividend="1", holding_period="2")
+
+
+@pytest.mark.parametrize("unit, as_years", [
+    ("years", True), ("Years", True), ("years ", True), (" YEARS", True),
+    ("months", False), ("Months", False), ("", False), (None, False),
+])
+def test_units_agree(unit, as_years):
+    row = dict(TRADE, unit=unit)
+    expected = returns.compute_row(row)
+    assert expected["years"] == (2 if as_years else 2 / 12)
+    params = {p: np.array([float(TRADE[c])]) for c, p in returns.TRADE_COLUMNS.items()}
+    vectorized = scenarios.compute(unit=[unit], **params)
+    for name in returns.RESULT_COLUMNS:
+        assert vectorized[name][0] == pytest.approx(expected[name])
+
+
+@pytest.mark.parametrize("unit", ["yrs", "weeks", "y"])
+def test_unknown_unit_rejected_by_both(unit):
+    with pytest.raises(returns.InputError):
+        returns.compute_row(dict(TRADE, unit=unit))
+    params = {p: np.array([float(TRADE[c])]) for c, p in returns.TRADE_COLUMNS.items()}
+    r = scenarios.compute(unit=np.array([unit, "years"], dtype=object), **params)
+    assert math.isnan(r["cagr"][0]) and not math.isnan(r["cagr"][1])
+
+
+def test_process_file_matches_returns(tmp_path):
+    portfolio_io = pytest.importorskip("portfolio_io")
+    pytest.importorskip("pandas")
+    units = ["years", "Years", "years ", "yrs", "months", ""]
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=[*TRADE, "unit"])
+    writer.writeheader()
+    writer.writerows(dict(TRADE, unit=u) for u in units)
+    src = tmp_path / "trades.csv"
+    src.write_text(text.getvalue())
+
+    rows = list(returns.process(csv.DictReader(io.StringIO(text.getvalue()))))
+    frame = next(portfolio_io.read_trades(src))
+    out = portfolio_io.compute_frame(frame)
+    for row, cagr in zip(rows, out["cagr"]):
+        if row["error"]:
+            assert math.isnan(cagr)
+        else:
+            assert cagr == pytest.approx(row["cagr"])
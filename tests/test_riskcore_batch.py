@@ -0,0 +1,50 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from riskcore.batch import UNSCORED, score_matrix, write_scores
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+def test_write_scores_mixed_null_columns_across_chunks(tmp_path, suffix):
+    # With chunksize=2, "amount" goes int -> blank/fraction and "owner"
+    # goes blank -> text between chunks.
+    src = tmp_path / "holdings.csv"
+    src.write_text("fund,amount,owner\nShort-Term Debt Funds,100,\nHybrid Funds (Balanced),200,\n"
+                   "Liquid,,alice\nSmall Cap / Sectoral Funds,1.5,bob\nShort-Term Debt Funds,7,\n")
+    dst = tmp_path / f"scores{suffix}"
+
+    assert write_scores(src, dst, [0, 5], chunksize=2) == 5
+
+    out = pd.read_parquet(dst) if suffix == ".parquet" else pd.read_csv(dst)
+    assert out["owner"].iloc[2] == "alice"
+    np.testing.assert_array_equal(out["score_5"], score_matrix(out["fund"].to_numpy(), [5])[:, 0])
+
+
+def test_unknown_fund_categories_are_not_scored():
+    from riskcore.batch import interpret_buckets
+
+    scores = score_matrix(["Hybrid Funds (Balanced)", "Hybrid Fund", "Crypto"], [0, 5])
+    assert scores[0].tolist() == [3.0, 2.4]
+    assert np.isnan(scores[1:]).all()
+    assert interpret_buckets(scores).tolist() == [[2, 1], [UNSCORED] * 2, [UNSCORED] * 2]
+
+
+def test_cli_runs_without_runpy_warning(tmp_path):
+    src = tmp_path / "holdings.csv"
+    src.write_text("fund\nShort-Term Debt Funds\nTypo Fund\n")
+    dst = tmp_path / "scores.csv"
+    result = subprocess.run([sys.executable, "-W", "error::RuntimeWarning", "-m", "riskcore.batch",
+                             str(src), str(dst)], capture_output=True, text=True,
+                            cwd=Path(__file__).parent.parent)
+    assert result.returncode == 0, result.stderr
+    assert "RuntimeWarning" not in result.stderr
+    out = pd.read_csv(dst)
+    assert out["bucket_5"].tolist() == [0, UNSCORED]
+    assert np.isnan(out["score_5"].iloc[1])
@@ -0,0 +1,66 @@
+import math
+import time
+from fractions import Fraction
+
+import pytest
+
+from calccore import sandbox
+from calccore.sandbox import CostLimitError, EvaluationTimeout, safe_evaluate
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("2^100", 2**100),
+    ("170!", math.factorial(170)),
+    ("nCr(1000,500)", math.comb(1000, 500)),
+    ("nPr(100,50)", math.perm(100, 50)),
+    ("pow(3,200)", 3**200),
+])
+def test_small_results_are_computed_inline(expr, expected):
+    assert safe_evaluate(expr) == expected
+
+
+@pytest.mark.parametrize("expr, backend", [
+    ("2^200000", "FLOAT"),
+    ("100000!", "FLOAT"),
+    ("nCr(10^6,5×10^5)", "FLOAT"),
+    ("nPr(10^6,10^5)", "FLOAT"),
+    ("7^(10^7)", "FRACTION"),
+    ("(1/3)^50000", "FRACTION"),
+    ("300000!", "FRACTION"),
+])
+def test_undisplayable_results_are_rejected_at_once(expr, backend):
+    start = time.perf_counter()
+    with pytest.raises(CostLimitError):
+        safe_evaluate(expr, backend=backend)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_limit_matches_what_can_be_displayed():
+    biggest = 2 ** sandbox.HARD_LIMIT_BITS - 1
+    str(biggest)
+    with pytest.raises(CostLimitError):
+        safe_evaluate(f"2^{sandbox.HARD_LIMIT_BITS + 1}")
+
+
+@pytest.fixture
+def offload(monkeypatch):
+    # Push mid-sized results out to the subprocess.
+    monkeypatch.setattr(sandbox, "INLINE_LIMIT_BITS", 256)
+    monkeypatch.setattr(sandbox, "HARD_LIMIT_BITS", 1 << 14)
+
+
+def test_offloaded_results_match_inline(offload):
+    assert safe_evaluate("2^1000") == 2**1000
+    assert safe_evaluate("(2/3)^300", backend="FRACTION") == Fraction(2, 3) ** 300
+    with pytest.raises(CostLimitError):
+        safe_evaluate("2^20000")
+
+
+def test_subprocess_errors_are_reraised(offload):
+    with pytest.raises(ZeroDivisionError):
+        safe_evaluate("2^1000÷0")
+
+
+def test_slow_subprocess_times_out(offload):
+    with pytest.raises(EvaluationTimeout):
+        safe_evaluate("2^1000", timeout=0.001)
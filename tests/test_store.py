@@ -0,0 +1,15 @@
+import sqlite3
+
+from weathercore.store import ResponseStore
+
+
+def test_unreadable_database_is_a_miss(tmp_path):
+    path = tmp_path / "cache.db"
+    store = ResponseStore(str(path))
+    assert store.put("London", {"temp": 12})
+    assert store.get("London")[0] == {"temp": 12}
+
+    with sqlite3.connect(path) as other:
+        other.execute("DROP TABLE responses")
+    assert store.get("London") is None
+    store.close()
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.mark.parametrize("module", ["weathercore.cities", "weathercore.icons"])
+def test_cli_runs_without_runpy_warning(module):
+    result = subprocess.run([sys.executable, "-W", "error::RuntimeWarning", "-m", module, "--help"],
+                            capture_output=True, text=True, cwd=ROOT)
+    assert result.returncode == 0, result.stderr
+    assert "RuntimeWarning" not in result.stderr
@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from weathercore.client import CityNotFound, RateLimited, RateLimiter, WeatherClient, WeatherError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_gives_up_after_max_wait():
+    clock = FakeClock()
+    limiter = RateLimiter(calls=2, period=60, max_wait=5, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    limiter.acquire()
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+    assert clock.slept == []
+
+    clock.now = 57.0  # the oldest call frees up within max_wait
+    limiter.acquire()
+    assert clock.slept == [3.0]
+
+
+def test_rate_limiter_without_max_wait_waits():
+    clock = FakeClock()
+    limiter = RateLimiter(calls=1, period=60, max_wait=None, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.slept == [60.0]
+
+
+# ---- WeatherClient against a local stub of the API ----
+class StubAPI(BaseHTTPRequestHandler):
+    requests = Counter()
+    release = threading.Event()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        city = query.get("q", query.get("id", [""]))[0]
+        self.requests[city] += 1
+        if city == "slow":
+            self.release.wait(5)
+        elif city == "sleepy":
+            time.sleep(1)
+        if city == "nowhere":
+            status, body = 404, {"cod": "404", "message": "city not found"}
+        else:
+            status, body = 200, {"cod": 200, "name": city.title(), "main": {"temp": 20}}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    StubAPI.requests = Counter()
+    StubAPI.release = threading.Event()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", StubAPI.requests
+    StubAPI.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_answers_are_cached_for_the_ttl(api):
+    base_url, requests = api
+    clock = FakeClock()
+    client = WeatherClient("key", base_url=base_url, ttl=600, clock=clock)
+    assert client.current("London")["name"] == "London"
+    assert client.current("  london ")["name"] == "London"
+    assert requests["london"] == 1
+
+    clock.now = 601
+    client.current("London")
+    assert requests["london"] == 2
+    client.close()
+
+
+def test_not_found_is_cached_for_its_own_ttl(api):
+    base_url, requests = api
+    clock = FakeClock()
+    client = WeatherClient("key", base_url=base_url, not_found_ttl=60, clock=clock)
+    for _ in range(2):
+        with pytest.raises(CityNotFound):
+            client.current("Nowhere")
+    assert requests["nowhere"] == 1
+
+    clock.now = 61
+    with pytest.raises(CityNotFound):
+        client.current("Nowhere")
+    assert requests["nowhere"] == 2
+    client.close()
+
+
+def test_concurrent_lookups_share_one_request(api):
+    base_url, requests = api
+    client = WeatherClient("key", base_url=base_url)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.current("Slow"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while client.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    StubAPI.release.set()
+    for t in threads:
+        t.join(5)
+    assert [r["name"] for r in results] == ["Slow"] * 5
+    assert requests["slow"] == 1
+    assert client.stats()["coalesced"] == 4
+    client.close()
+
+
+def test_slow_service_fails_within_the_read_timeout(api):
+    base_url, requests = api
+    client = WeatherClient("key", base_url=base_url, timeout=(1, 0.2))
+    start = time.monotonic()
+    with pytest.raises(WeatherError):
+        client.current("Sleepy")
+    assert time.monotonic() - start < 0.9
+    assert requests["sleepy"] == 1  # read timeouts are not retried
+    client.close()
@@ -0,0 +1,27 @@
+"""
+weathercore
+Streamlit-free core for the weather app
+---------------------------------------
+ - client  pooled, cached, coalescing OpenWeatherMap client
+ - batch   concurrent multi-city lookups for comparison tables
+ - cities  offline, memory-mapped city name -> ID index (imports NumPy)
+ - store   on-disk SQLite response cache with stale-while-revalidate
+ - icons   condition icons cached locally and inlined as data: URIs
+"""
+
+import importlib
+
+from .batch import fetch_many, parse_cities, read_cities
+from .client import CityNotFound, RateLimited, RateLimiter, WeatherClient, WeatherError, normalize_city
+from .store import ResponseStore, open_store
+
+# Modules with a command line (python -m weathercore.<module>) are imported
+# on first use, so runpy doesn't find them already loaded and warn.
+_LAZY = {"City": "cities", "CityIndex": "cities", "load_index": "cities",
+         "ICON_CODES": "icons", "IconCache": "icons", "icon_uri": "icons"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
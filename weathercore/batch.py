@@ -0,0 +1,116 @@
+"""
+weathercore/batch.py
+Multi-city weather lookups
+--------------------------
+fetch_many() looks up a list of cities on a bounded thread pool that
+shares one WeatherClient, so its connection pool, cache and request
+coalescing apply to every city. Give the client a RateLimiter to hold
+upstream calls to a calls-per-minute budget; cache hits don't spend it,
+and cities that would wait past its ``max_wait`` come back as errors.
+
+parse_cities() / read_cities() turn a pasted list or an uploaded file
+(one city per line, or a CSV with a ``city`` column) into a de-duplicated
+query list, and summarize() flattens each answer into one table row.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .client import POOL_SIZE, CityNotFound, WeatherError, normalize_city
+
+DEFAULT_CONCURRENCY = int(os.environ.get("OPENWEATHER_BATCH_CONCURRENCY", 8))
+MAX_CITIES = 1000
+
+COLUMNS = ("City", "Country", "Condition", "Temp (°C)", "Feels like (°C)",
+           "Humidity (%)", "Wind (m/s)", "Pressure (hPa)", "Error")
+
+
+def parse_cities(text, limit=MAX_CITIES):
+    """City queries from text, one per line; blank lines and ``#`` comments
+    are skipped and repeats (after normalization) dropped."""
+    cities, seen = [], set()
+    for line in text.splitlines():
+        city = " ".join(line.split("#", 1)[0].split())
+        key = normalize_city(city)
+        if key and key not in seen:
+            seen.add(key)
+            cities.append(city)
+            if len(cities) >= limit:
+                break
+    return cities
+
+
+def read_cities(data, limit=MAX_CITIES):
+    """City queries from uploaded file bytes: a CSV with a ``city`` column,
+    or a plain list with one city per line."""
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    rows = csv.reader(io.StringIO(text))
+    header = next(rows, [])
+    column = [h.strip().casefold() for h in header]
+    if "city" not in column:
+        return parse_cities(text, limit)
+    i = column.index("city")
+    # Keep a country column as the "City, CC" qualifier the API understands.
+    j = column.index("country") if "country" in column else None
+    lines = []
+    for row in rows:
+        if len(row) > i:
+            country = row[j].strip() if j is not None and len(row) > j else ""
+            lines.append(f"{row[i]}, {country}" if country else row[i])
+    return parse_cities("\n".join(lines), limit)
+
+
+def summarize(city, data=None, error=None):
+    """One comparison-table row (COLUMNS) for a lookup result."""
+    if data is None:
+        return dict.fromkeys(COLUMNS, None) | {"City": city, "Error": error}
+    return {
+        "City": data.get("name") or city,
+        "Country": data["sys"].get("country"),
+        "Condition": data["weather"][0]["description"].title(),
+        "Temp (°C)": data["main"]["temp"],
+        "Feels like (°C)": data["main"]["feels_like"],
+        "Humidity (%)": data["main"]["humidity"],
+        "Wind (m/s)": data["wind"]["speed"],
+        "Pressure (hPa)": data["main"]["pressure"],
+        "Error": None,
+    }
+
+
+def _lookup(client, city, units, index):
+    try:
+        if index is None:
+            return summarize(city, client.current(city, units=units))
+        match = index.resolve(city)
+        if match is None:
+            raise CityNotFound(city)
+        return summarize(match.label, client.current_by_id(match.id, units=units))
+    except CityNotFound:
+        return summarize(city, error="City not found")
+    except WeatherError as e:
+        return summarize(city, error=str(e))
+    except (KeyError, IndexError, TypeError):
+        return summarize(city, error="Unexpected response")
+
+
+def fetch_many(client, cities, units="metric", concurrency=DEFAULT_CONCURRENCY, progress=None, index=None):
+    """Table rows for ``cities``, in input order.
+
+    With a CityIndex, names are resolved to city IDs first and unknown
+    ones fail without a network call.
+
+    At most ``concurrency`` lookups run at once (capped at the client's
+    connection pool size). ``progress(done, total)`` is called from the
+    calling thread as results arrive.
+    """
+    rows = [None] * len(cities)
+    workers = max(1, min(concurrency, POOL_SIZE, len(cities) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather") as pool:
+        futures = {pool.submit(_lookup, client, city, units, index): i for i, city in enumerate(cities)}
+        for done, future in enumerate(as_completed(futures), 1):
+            rows[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(cities))
+    return rows
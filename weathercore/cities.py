@@ -0,0 +1,240 @@
+"""
+weathercore/cities.py
+Offline city index
+------------------
+Resolves what the user typed to an OpenWeatherMap city ID before any
+network call, and suggests cities as they type. The index is built once
+from OpenWeatherMap's bulk city list (city.list.json[.gz], from
+https://bulk.openweathermap.org/sample/) into one compact file:
+
+    python -m weathercore.cities city.list.json.gz city.idx
+
+and is memory-mapped on open, so start-up costs no parsing and the pages
+are shared between server processes. Records are sorted by folded name
+(case-folded, accents stripped), so a prefix lookup is a binary search;
+fuzzy matches for misspellings are scored among names with the same
+first letter and a similar length. Cities sharing a name are ordered by
+population when the list has it (current.city.list.json does), so
+"London" means London, GB.
+
+Set OPENWEATHER_CITY_INDEX to the index file; if it doesn't exist yet and
+OPENWEATHER_CITY_LIST names the bulk list, load_index() builds it.
+"""
+
+import argparse
+import bisect
+import difflib
+import gzip
+import json
+import mmap
+import os
+import struct
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.environ.get("OPENWEATHER_CITY_INDEX")
+DEFAULT_CITY_LIST = os.environ.get("OPENWEATHER_CITY_LIST")
+MAGIC = b"OWCITY1\0"
+HEADER = struct.Struct("<8sII")  # magic, record count, string blob size
+RECORD = np.dtype([("id", "<u4"), ("lat", "<f4"), ("lon", "<f4"), ("country", "S2"), ("state", "S2"),
+                   ("population", "<u4"), ("key_off", "<u4"), ("key_len", "<u2"), ("name_off", "<u4"), ("name_len", "<u2")])
+SUGGESTIONS = 10
+FUZZY_CUTOFF = 0.75
+FUZZY_LENGTH_SLACK = 2
+
+
+class City(namedtuple("City", "id name state country lat lon")):
+    __slots__ = ()
+
+    @property
+    def label(self):
+        """"Name, ST, CC" as shown to the user."""
+        return ", ".join(p for p in (self.name, self.state, self.country) if p)
+
+
+def fold(text):
+    """Index key form of a name: case-folded, accents stripped, single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.casefold().split())
+
+
+def parse_query(query):
+    """``(folded name, qualifiers)`` for "Name[, State][, Country]".
+
+    Only two-letter codes qualify; longer parts ("Delhi, India") are
+    ignored rather than matching nothing.
+    """
+    name, *rest = query.split(",")
+    return fold(name), [q.strip().upper() for q in rest if len(q.strip()) == 2]
+
+
+# ---- building ----
+def _population(c):
+    return int((c.get("stat") or {}).get("population") or c.get("population") or 0)
+
+
+def _load_city_list(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_index(cities, dst):
+    """Write the index for ``cities`` (bulk list path, or its parsed list of
+    dicts) to ``dst``; returns the number of cities."""
+    if isinstance(cities, (str, os.PathLike)):
+        cities = _load_city_list(cities)
+    entries = sorted(((fold(c["name"]), c) for c in cities if c.get("name")),
+                     key=lambda e: (e[0], -_population(e[1]), e[1].get("country", ""), e[1]["id"]))
+    records = np.zeros(len(entries), dtype=RECORD)
+    blob = bytearray()
+    for i, (key, c) in enumerate(entries):
+        key_b, name_b = key.encode(), c["name"].encode()
+        coord = c.get("coord") or {}
+        records[i] = (c["id"], coord.get("lat", np.nan), coord.get("lon", np.nan),
+                      (c.get("country") or "").encode()[:2], (c.get("state") or "").encode()[:2],
+                      min(_population(c), 2**32 - 1), len(blob), len(key_b), len(blob) + len(key_b), len(name_b))
+        blob += key_b + name_b
+    tmp = f"{dst}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), len(blob)))
+        f.write(records.tobytes())
+        f.write(blob)
+    os.replace(tmp, dst)
+    return len(records)
+
+
+# ---- lookups ----
+class CityIndex:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, blob_size = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a city index")
+        self.records = np.frombuffer(self._mm, dtype=RECORD, count=count, offset=HEADER.size)
+        self._blob = HEADER.size + count * RECORD.itemsize
+        self._keys = _Keys(self)
+
+    def __len__(self):
+        return len(self.records)
+
+    def _str(self, off, length):
+        start = self._blob + int(off)
+        return self._mm[start:start + int(length)].decode()
+
+    def key(self, i):
+        r = self.records[i]
+        return self._str(r["key_off"], r["key_len"])
+
+    def city(self, i):
+        r = self.records[i]
+        return City(int(r["id"]), self._str(r["name_off"], r["name_len"]), r["state"].decode(),
+                    r["country"].decode(), float(r["lat"]), float(r["lon"]))
+
+    def _range(self, lo_key, hi_key):
+        return bisect.bisect_left(self._keys, lo_key), bisect.bisect_left(self._keys, hi_key)
+
+    def _filter(self, lo, hi, qualifiers):
+        # Indexes in [lo, hi) whose country or state matches every qualifier.
+        rows = self.records[lo:hi]
+        keep = np.ones(len(rows), dtype=bool)
+        for q in qualifiers:
+            code = q.encode()
+            keep &= (rows["country"] == code) | (rows["state"] == code)
+        return lo + np.flatnonzero(keep)
+
+    def exact(self, query, limit=SUGGESTIONS):
+        """Cities named exactly ``query`` ("Name[, State][, Country]")."""
+        key, qualifiers = parse_query(query)
+        return [self.city(i) for i in self._filter(*self._range(key, key + "\0"), qualifiers)[:limit]]
+
+    def prefix(self, query, limit=SUGGESTIONS):
+        """Cities whose name starts with ``query``, exact and shorter names first."""
+        key, qualifiers = parse_query(query)
+        if not key:
+            return []
+        indexes = self._filter(*self._range(key, key + "\U0010ffff"), qualifiers)
+        shortest = np.argsort(self.records["key_len"][indexes], kind="stable")[:limit]
+        return [self.city(i) for i in indexes[shortest]]
+
+    def fuzzy(self, query, limit=SUGGESTIONS, cutoff=FUZZY_CUTOFF):
+        """Closest names to a misspelled ``query``, best first."""
+        key, qualifiers = parse_query(query)
+        if not key:
+            return []
+        lo, hi = self._range(key[0], chr(ord(key[0]) + 1))
+        lengths = self.records["key_len"][lo:hi].astype(int)
+        near = lo + np.flatnonzero(np.abs(lengths - len(key.encode())) <= FUZZY_LENGTH_SLACK)
+        matcher = difflib.SequenceMatcher(b=key, autojunk=False)
+        seen, scored = set(), {}
+        for i in near:
+            candidate = self.key(i)
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    # Records are population-ordered, so i is the biggest city of this name.
+                    scored[candidate] = (ratio, int(self.records[i]["population"]))
+        out = []
+        for candidate in sorted(scored, key=scored.get, reverse=True):
+            indexes = self._filter(*self._range(candidate, candidate + "\0"), qualifiers)
+            out += [self.city(i) for i in indexes[:limit - len(out)]]
+            if len(out) >= limit:
+                break
+        return out
+
+    def suggest(self, query, limit=SUGGESTIONS):
+        """Prefix matches, or fuzzy ones when nothing starts with ``query``."""
+        return self.prefix(query, limit) or self.fuzzy(query, limit)
+
+    def resolve(self, query):
+        """The one city ``query`` most likely means, or None."""
+        matches = self.exact(query, 1) or self.fuzzy(query, 1)
+        return matches[0] if matches else None
+
+    def close(self):
+        self.records = None
+        self._mm.close()
+
+
+class _Keys:
+    # Sequence view of the sorted keys, for bisect.
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        return self.index.key(i)
+
+
+def load_index(path=DEFAULT_INDEX_PATH, city_list=DEFAULT_CITY_LIST):
+    """Open the index at ``path``, building it from ``city_list`` first if
+    it is missing. None when neither is configured or present."""
+    if not path:
+        return None
+    if not os.path.exists(path):
+        if not (city_list and os.path.exists(city_list)):
+            return None
+        build_index(city_list, path)
+    return CityIndex(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline city index.")
+    parser.add_argument("src", help="OpenWeatherMap city.list.json or city.list.json.gz")
+    parser.add_argument("dst", help="index file to write")
+    args = parser.parse_args(argv)
+    print(f"Indexed {build_index(args.src, args.dst):,} cities -> {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+weathercore/client.py
+OpenWeatherMap client
+---------------------
+One WeatherClient per process shares a pooled requests.Session, so
+lookups reuse open keep-alive connections instead of paying a TCP+TLS
+handshake each. Responses are cached per (normalized city, units) for a
+TTL (or per city ID), "city not found" answers for a shorter one. Concurrent lookups of
+the same key are coalesced: the first caller fetches and the others wait
+for its result. Every request has connect and read timeouts, and an
+optional RateLimiter keeps upstream calls within the API plan's budget;
+a call that would have to wait longer than its ``max_wait`` fails with
+RateLimited rather than queueing every session behind a big batch.
+With a ResponseStore (store.py) behind the memory cache, answers survive
+restarts and stale ones are served while a background refresh runs.
+
+Point OPENWEATHER_BASE_URL (or ``base_url``) at a local stub server to
+run without the real service; OPENWEATHER_API_KEY supplies the key.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = os.environ.get("OPENWEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+DEFAULT_API_KEY = os.environ.get("OPENWEATHER_API_KEY", "YOUR_API_KEY_HERE")
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+DEFAULT_TTL = 600
+NOT_FOUND_TTL = 60
+REFRESH_INTERVAL = 30  # seconds between refresh attempts for a stale entry
+MAX_ENTRIES = 2048
+POOL_SIZE = 32
+# OpenWeatherMap's free plan allows 60 calls a minute.
+RATE_LIMIT = int(os.environ.get("OPENWEATHER_RATE_LIMIT", 60))
+RATE_PERIOD = 60.0
+RATE_MAX_WAIT = float(os.environ.get("OPENWEATHER_RATE_MAX_WAIT", 5))
+
+
+class WeatherError(Exception):
+    """The weather service couldn't be reached or gave an unusable answer."""
+
+
+class CityNotFound(WeatherError):
+    pass
+
+
+class RateLimited(WeatherError):
+    """The call budget is spent for longer than the caller may wait."""
+
+
+def normalize_city(city):
+    """Cache key form of a city query: case-folded, single spaces, tight commas."""
+    city = re.sub(r"\s+", " ", city).strip().casefold()
+    return re.sub(r"\s*,\s*", ",", city).strip(",")
+
+
+class RateLimiter:
+    """At most ``calls`` acquisitions in any ``period`` seconds (sliding window).
+    ``max_wait=None`` waits as long as it takes."""
+
+    def __init__(self, calls=RATE_LIMIT, period=RATE_PERIOD, max_wait=RATE_MAX_WAIT,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.calls = calls
+        self.period = period
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call fits in the budget, then spend it; RateLimited
+        if that would take more than ``max_wait`` seconds in all."""
+        deadline = None if self.max_wait is None else self.clock() + self.max_wait
+        while True:
+            with self._lock:
+                now = self.clock()
+                while self._times and self._times[0] <= now - self.period:
+                    self._times.popleft()
+                if len(self._times) < self.calls:
+                    self._times.append(now)
+                    return
+                wait = self._times[0] + self.period - now
+            if deadline is not None and now + wait > deadline:
+                raise RateLimited(f"Rate limit of {self.calls} calls per {self.period:g}s reached; "
+                                  f"try again in {wait:.0f}s")
+            self.sleep(wait)
+
+
+_MISSING = object()
+
+
+class _Call:
+    # One in-flight upstream request that other callers can wait on.
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class WeatherClient:
+    def __init__(self, api_key=DEFAULT_API_KEY, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 ttl=DEFAULT_TTL, not_found_ttl=NOT_FOUND_TTL, max_entries=MAX_ENTRIES, pool_size=POOL_SIZE,
+                 limiter=None, store=None, clock=time.monotonic):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.max_entries = max_entries
+        self.limiter = limiter
+        self.store = store
+        self.clock = clock
+        self.session = requests.Session()
+        # Retry only connection setup and gateway errors, never a read
+        # timeout, so a slow upstream fails fast instead of multiplying.
+        retry = Retry(total=2, connect=2, read=0, backoff_factor=0.2,
+                      status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._cache = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-refresh")
+        self.hits = self.misses = self.coalesced = 0
+        self.disk_hits = self.stale_hits = self.refreshes = self.refresh_errors = 0
+
+    # ---- upstream ----
+    def _fetch(self, params):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        try:
+            response = self.session.get(f"{self.base_url}/weather", timeout=self.timeout,
+                                        params=dict(params, appid=self.api_key))
+        except requests.RequestException as e:
+            raise WeatherError(f"Weather service unreachable: {e}") from e
+        try:
+            data = response.json()
+        except ValueError:
+            raise WeatherError(f"Weather service returned HTTP {response.status_code}") from None
+        # OpenWeatherMap reports errors in "cod", sometimes as a string.
+        if str(data.get("cod")) == "404":
+            raise CityNotFound(data.get("message", "city not found"))
+        if str(data.get("cod")) != "200":
+            raise WeatherError(data.get("message") or f"HTTP {response.status_code}")
+        return data
+
+    # ---- cache + coalescing ----
+    def _store(self, key, value, ttl):
+        now = self.clock()
+        if len(self._cache) >= self.max_entries:
+            for k in [k for k, (expires, _) in self._cache.items() if expires <= now]:
+                del self._cache[k]
+            while len(self._cache) >= self.max_entries:
+                del self._cache[next(iter(self._cache))]
+        self._cache.pop(key, None)
+        self._cache[key] = (now + ttl, value)
+
+    def _memory_get(self, key):
+        # Call with the lock held.
+        entry = self._cache.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return _MISSING
+        if isinstance(entry[1], CityNotFound):
+            raise CityNotFound(*entry[1].args)
+        return entry[1]
+
+    def _disk_get(self, key, params):
+        # Fresh disk entries are promoted to memory; stale ones are served
+        # while a background refresh replaces them.
+        cached = self.store.get(key)
+        if cached is None:
+            return _MISSING
+        value, age = cached
+        with self._lock:
+            if age < self.store.max_age:
+                self.disk_hits += 1
+                self._store(key, value, self.store.max_age - age)
+                return value
+            self.stale_hits += 1
+            # Serve it from memory until the refresh lands (or can be retried),
+            # so an outage costs one upstream attempt per interval, not per view.
+            self._store(key, value, REFRESH_INTERVAL)
+            if key in self._inflight:
+                return value
+            self.refreshes += 1
+        self._refresher.submit(self._revalidate, key, params)
+        return value
+
+    def _revalidate(self, key, params):
+        try:
+            self._fetch_shared(key, params, refresh=True)
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+
+    def _fetch_shared(self, key, params, refresh=False):
+        with self._lock:
+            call = self._inflight.get(key)
+            owner = call is None
+            if owner:
+                call = self._inflight[key] = _Call()
+                self.misses += not refresh
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        ttl = value = None
+        try:
+            value = call.result = self._fetch(params)
+            ttl = self.ttl
+            if self.store is not None:
+                self.store.put(key, value)
+        except CityNotFound as e:
+            call.error = value = e
+            ttl = self.not_found_ttl
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                if ttl is not None:
+                    self._store(key, value, ttl)
+                del self._inflight[key]
+            call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _lookup(self, key, params):
+        with self._lock:
+            value = self._memory_get(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+        if self.store is not None:
+            value = self._disk_get(key, params)
+            if value is not _MISSING:
+                return value
+        return self._fetch_shared(key, params)
+
+    # ---- public API ----
+    def current(self, city, units="metric"):
+        """Current weather JSON for ``city`` ("Delhi", "Delhi, IN", ...)."""
+        key = ("q", normalize_city(city), units)
+        return self._lookup(key, {"q": key[1], "units": units})
+
+    def current_by_id(self, city_id, units="metric"):
+        """Current weather JSON for an OpenWeatherMap city ID (see cities.py)."""
+        key = ("id", int(city_id), units)
+        return self._lookup(key, {"id": key[1], "units": units})
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "stale_hits": self.stale_hits,
+                    "misses": self.misses, "coalesced": self.coalesced, "refreshes": self.refreshes,
+                    "refresh_errors": self.refresh_errors, "cached": len(self._cache)}
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        self.session.close()
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,152 @@
+"""
+weathercore/icons.py
+Local weather icons
+-------------------
+OpenWeatherMap uses a fixed set of 18 condition icons. Each is fetched
+at most once (over HTTPS), kept in ICON_DIR and in memory, and handed to
+st.image as a data: URI. The picture travels inside the page update, with
+no separate image request for the browser to make or cache. Streamlit
+can't set long-lived Cache-Control headers on its media or static routes,
+so inlining the picture is the only way to remove that request.
+
+Downloads run outside the cache lock, so a slow fetch never holds up
+other icons; concurrent requests for the same missing icon share one
+download, as WeatherClient does for API calls.
+
+Fill ICON_DIR ahead of time to ship the icons with the app:
+
+    python -m weathercore.icons
+
+ICON_DIR defaults to weathercore/icons; set OPENWEATHER_ICON_DIR to use
+another directory. If it isn't writable the icons stay in memory only.
+"""
+
+import argparse
+import base64
+import os
+import threading
+import time
+
+import requests
+
+from .client import DEFAULT_TIMEOUT, _Call
+
+ICON_CODES = tuple(f"{n:02d}{t}" for n in (1, 2, 3, 4, 9, 10, 11, 13, 50) for t in "dn")
+ICON_URL = os.environ.get("OPENWEATHER_ICON_URL", "https://openweathermap.org/img/wn/{code}@2x.png")
+ICON_DIR = os.environ.get("OPENWEATHER_ICON_DIR", os.path.join(os.path.dirname(__file__), "icons"))
+RETRY_AFTER = 300  # seconds before retrying an icon that failed to download
+
+
+class IconCache:
+    def __init__(self, directory=ICON_DIR, url=ICON_URL, timeout=DEFAULT_TIMEOUT, session=None):
+        self.directory = directory
+        self.url = url
+        self.timeout = timeout
+        self.session = session
+        self._png = {}
+        self._uri = {}
+        self._failed = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _path(self, code):
+        return os.path.join(self.directory, f"{code}@2x.png")
+
+    def _read(self, code):
+        try:
+            with open(self._path(code), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _download(self, code):
+        try:
+            response = self.session.get(self.url.format(code=code), timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            return None
+        data = response.content
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self._path(code)}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(code))
+        except OSError:
+            pass
+        return data
+
+    def _load(self, code):
+        data = self._read(code)
+        failed = self._failed.get(code)
+        if data is None and (failed is None or time.monotonic() - failed >= RETRY_AFTER):
+            data = self._download(code)
+            if data is None:
+                self._failed[code] = time.monotonic()
+        return data
+
+    def png(self, code):
+        """PNG bytes of icon ``code`` ("01d", ...), or None if unknown or
+        unavailable."""
+        if code not in ICON_CODES:
+            return None
+        data = self._png.get(code)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self._png.get(code)
+            if data is not None:
+                return data
+            call = self._inflight.get(code)
+            owner = call is None
+            if owner:
+                call = self._inflight[code] = _Call()
+                if self.session is None:
+                    self.session = requests.Session()
+
+        if not owner:
+            call.done.wait()
+            return call.result
+
+        try:
+            data = call.result = self._load(code)
+        finally:
+            with self._lock:
+                if data is not None:
+                    self._png[code] = data
+                del self._inflight[code]
+            call.done.set()
+        return data
+
+    def data_uri(self, code):
+        """``data:image/png;base64,...`` for icon ``code``, or None."""
+        uri = self._uri.get(code)
+        if uri is None:
+            data = self.png(code)
+            if data is None:
+                return None
+            uri = self._uri[code] = "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+        return uri
+
+    def fetch_all(self):
+        """Make sure every icon is in ``directory``; returns how many are."""
+        return sum(self.png(code) is not None and os.path.exists(self._path(code)) for code in ICON_CODES)
+
+
+ICONS = IconCache()
+
+
+def icon_uri(code):
+    return ICONS.data_uri(code)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the weather icons for bundling.")
+    parser.add_argument("directory", nargs="?", default=ICON_DIR, help="where to save them")
+    args = parser.parse_args(argv)
+    count = IconCache(args.directory).fetch_all()
+    print(f"{count}/{len(ICON_CODES)} icons in {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
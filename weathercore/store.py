@@ -0,0 +1,97 @@
+"""
+weathercore/store.py
+On-disk response cache
+----------------------
+Keeps the last good answer for every lookup in a small SQLite database,
+so a restarted server starts warm and a slow or unreachable weather
+service doesn't take the page down with it. WeatherClient consults it
+after its in-memory cache:
+
+ - younger than ``max_age``               served as fresh
+ - up to ``stale_ttl`` seconds past that  served at once while a
+                                          background refresh runs
+ - older                                  refetched before answering
+
+Timestamps are wall-clock, so ages carry over restarts. The database is
+in WAL mode, so several server processes can share one file.
+
+Set OPENWEATHER_CACHE_DB to the database path to turn it on, and
+OPENWEATHER_MAX_AGE / OPENWEATHER_STALE_TTL (seconds) to tune it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_DB_PATH = os.environ.get("OPENWEATHER_CACHE_DB")
+MAX_AGE = int(os.environ.get("OPENWEATHER_MAX_AGE", 600))
+STALE_TTL = int(os.environ.get("OPENWEATHER_STALE_TTL", 86400))
+
+
+class ResponseStore:
+    def __init__(self, path, max_age=MAX_AGE, stale_ttl=STALE_TTL, clock=time.time):
+        self.path = path
+        self.max_age = max_age
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                         "key TEXT PRIMARY KEY, fetched REAL NOT NULL, body TEXT NOT NULL)")
+
+    def get(self, key):
+        """``(value, age in seconds)`` for ``key``, or None if absent, past
+        the stale window, or unreadable (a locked or corrupt database falls
+        through to the network like any miss)."""
+        try:
+            with self._lock:
+                row = self._db.execute("SELECT fetched, body FROM responses WHERE key = ?",
+                                       (json.dumps(key),)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        age = self.clock() - row[0]
+        if age >= self.max_age + self.stale_ttl:
+            return None
+        return json.loads(row[1]), max(age, 0.0)
+
+    def put(self, key, value):
+        """Save ``value`` for ``key``; False if the database couldn't take it
+        (a full disk or a long lock must not fail the lookup itself)."""
+        try:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO responses (key, fetched, body) VALUES (?, ?, ?)",
+                                 (json.dumps(key), self.clock(), json.dumps(value)))
+        except sqlite3.Error:
+            return False
+        return True
+
+    def purge(self):
+        """Delete entries past the stale window; returns how many."""
+        with self._lock:
+            cur = self._db.execute("DELETE FROM responses WHERE fetched < ?",
+                                   (self.clock() - self.max_age - self.stale_ttl,))
+        return cur.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def open_store(path=DEFAULT_DB_PATH, **kwargs):
+    """ResponseStore at ``path`` with expired entries purged, or None if
+    no path is configured."""
+    if not path:
+        return None
+    store = ResponseStore(path, **kwargs)
+    store.purge()
+    return store
@@ -1,7 +1,11 @@
 import streamlit as st
-import requests
 from datetime import datetime
 
+from weathercore import (CityNotFound, RateLimited, RateLimiter, WeatherClient, fetch_many,
+                         icon_uri, load_index, open_store, parse_cities, read_cities)
+from weathercore.batch import DEFAULT_CONCURRENCY, MAX_CITIES
+from weathercore.client import POOL_SIZE
+
 # ---- PAGE CONFIG ----
 st.set_page_config(page_title="Weather Forecast App", page_icon="🌤️", layout="centered")
 
@@ -9,52 +13,119 @@ st.set_page_config(page_title="Weather Forecast App", page_icon="🌤️", layou
 st.title("🌦️ Real-Time Weather Forecast App")
 st.write("Get instant weather updates for any city in the world!")
 
+# ---- CITY INDEX ----
+# Offline name -> city ID index (see weathercore/cities.py); None if not set up,
+# in which case names go to the API as typed.
+@st.cache_resource
+def get_city_index():
+    return load_index()
+
+city_index = get_city_index()
+
 # ---- INPUT ----
 city = st.text_input("Enter city name", placeholder="e.g. Mumbai, Maharashtra or Delhi, India")
 
+choice = None
+if city_index is not None and city.strip():
+    suggestions = city_index.suggest(city)
+    if suggestions:
+        choice = st.selectbox("Matching cities", suggestions,
+                              format_func=lambda c: f"{c.label} ({c.lat:.2f}, {c.lon:.2f})")
+    else:
+        st.caption("No matching city in the offline index.")
+
 # ---- API KEY ----
-api_key = "YOUR_API_KEY_HERE"  # 🔹 Replace with your OpenWeather API key
+api_key = "YOUR_API_KEY_HERE"  # 🔹 Replace with your OpenWeather API key (or set OPENWEATHER_API_KEY)
+
+# ---- WEATHER CLIENT ----
+# One client per server process: all sessions share its connection pool,
+# response caches (memory, then OPENWEATHER_CACHE_DB on disk), in-flight
+# requests and API rate budget.
+@st.cache_resource
+def get_client(api_key):
+    options = dict(limiter=RateLimiter(), store=open_store())
+    if api_key == "YOUR_API_KEY_HERE":
+        return WeatherClient(**options)
+    return WeatherClient(api_key, **options)
+
+client = get_client(api_key)
 
 # ---- WHEN USER CLICKS BUTTON ----
 if st.button("Get Weather"):
     if city.strip():
         try:
-            # 🧩 Handle extra spaces, commas
-            city_clean = city.replace(",", "").strip()
-
-            # ---- API URL ----
-            url = f"https://api.openweathermap.org/data/2.5/weather?q={city_clean}&appid={api_key}&units=metric"
-            response = requests.get(url)
-            data = response.json()
+            # 🧩 Extra spaces are collapsed; "City, Country" is kept as a qualifier
+            city_clean = " ".join(city.split())
+            if city_index is None:
+                data = client.current(city_clean, units="metric")
+            elif choice is None:
+                raise CityNotFound(city_clean)  # known misspelling: no network call
+            else:
+                city_clean = choice.name
+                data = client.current_by_id(choice.id, units="metric")
 
             # ---- SUCCESS ----
-            if data["cod"] == 200:
-                weather = data["weather"][0]["main"]
-                description = data["weather"][0]["description"].title()
-                icon = data["weather"][0]["icon"]
-                temp = data["main"]["temp"]
-                feels_like = data["main"]["feels_like"]
-                humidity = data["main"]["humidity"]
-                pressure = data["main"]["pressure"]
-                wind = data["wind"]["speed"]
-                country = data["sys"]["country"]
-                sunrise = datetime.utcfromtimestamp(data["sys"]["sunrise"]).strftime("%H:%M:%S")
-                sunset = datetime.utcfromtimestamp(data["sys"]["sunset"]).strftime("%H:%M:%S")
-
-                st.markdown(f"### 📍 {city_clean.title()}, {country}")
-                st.image(f"http://openweathermap.org/img/wn/{icon}@2x.png", width=100)
-                st.markdown(f"**🌤️ {weather} ({description})**")
-                st.metric("🌡️ Temperature", f"{temp}°C", f"Feels like {feels_like}°C")
-                st.metric("💧 Humidity", f"{humidity}%")
-                st.metric("🌬️ Wind Speed", f"{wind} m/s")
-                st.metric("🔼 Pressure", f"{pressure} hPa")
-                st.markdown(f"🌅 **Sunrise:** {sunrise} UTC")
-                st.markdown(f"🌇 **Sunset:** {sunset} UTC")
+            weather = data["weather"][0]["main"]
+            description = data["weather"][0]["description"].title()
+            icon = data["weather"][0]["icon"]
+            temp = data["main"]["temp"]
+            feels_like = data["main"]["feels_like"]
+            humidity = data["main"]["humidity"]
+            pressure = data["main"]["pressure"]
+            wind = data["wind"]["speed"]
+            country = data["sys"]["country"]
+            sunrise = datetime.utcfromtimestamp(data["sys"]["sunrise"]).strftime("%H:%M:%S")
+            sunset = datetime.utcfromtimestamp(data["sys"]["sunset"]).strftime("%H:%M:%S")
 
-            else:
-                st.error("❌ City not found! Please check the name and try again.")
+            st.markdown(f"### 📍 {city_clean.title()}, {country}")
+            # Inlined from the local icon cache; the remote URL only if that fails
+            st.image(icon_uri(icon) or f"https://openweathermap.org/img/wn/{icon}@2x.png", width=100)
+            st.markdown(f"**🌤️ {weather} ({description})**")
+            st.metric("🌡️ Temperature", f"{temp}°C", f"Feels like {feels_like}°C")
+            st.metric("💧 Humidity", f"{humidity}%")
+            st.metric("🌬️ Wind Speed", f"{wind} m/s")
+            st.metric("🔼 Pressure", f"{pressure} hPa")
+            st.markdown(f"🌅 **Sunrise:** {sunrise} UTC")
+            st.markdown(f"🌇 **Sunset:** {sunset} UTC")
 
-        except Exception as e:
+        except CityNotFound:
+            st.error("❌ City not found! Please check the name and try again.")
+        except RateLimited:
+            st.error("⏳ Too many requests right now. Please try again in a minute.")
+        except Exception:
             st.error("⚠️ Something went wrong! Check your internet connection or API key.")
     else:
         st.warning("Please enter a city name to continue.")
+
+# ---- COMPARE MANY CITIES ----
+with st.expander("🏙️ Compare many cities"):
+    cities_text = st.text_area("Cities, one per line", placeholder="Mumbai, IN\nDelhi, IN\nLondon, GB", height=150)
+    upload = st.file_uploader("...or upload a list (one city per line, or a CSV with a 'city' column)",
+                              type=["txt", "csv"])
+    concurrency = st.slider("Parallel requests", 1, POOL_SIZE, DEFAULT_CONCURRENCY)
+
+    if st.button("Compare"):
+        cities = parse_cities(cities_text)
+        if upload is not None:
+            cities = parse_cities("\n".join(cities + read_cities(upload.getvalue())))
+        if cities:
+            progress = st.progress(0.0, text=f"Fetching {len(cities)} cities...")
+            st.session_state.batch_rows = fetch_many(
+                client, cities, concurrency=concurrency, index=city_index,
+                progress=lambda done, total: progress.progress(done / total, text=f"Fetched {done}/{total}"))
+            progress.empty()
+        else:
+            st.warning(f"Please enter or upload at least one city (up to {MAX_CITIES}).")
+
+    rows = st.session_state.get("batch_rows")
+    if rows:
+        failed = sum(row["Error"] is not None for row in rows)
+        st.caption(f"{len(rows)} cities, {failed} failed. Click a column header to sort.")
+        st.dataframe(rows, hide_index=True, width="stretch", column_config={
+            "Temp (°C)": st.column_config.NumberColumn(format="%.1f"),
+            "Feels like (°C)": st.column_config.NumberColumn(format="%.1f"),
+        })
+
+# ---- CACHE STATS ----
+with st.sidebar.expander("📊 Cache stats"):
+    st.json(client.stats())